@@ -0,0 +1,112 @@
+"""
+"What should I do" advice for Mississippi Stud partial hands.
+
+For a 2-, 3- or 4-card hand (the hand seen at step 1, 2 or 3 of BaseStrategy)
+and any dead cards seen at other seats, returns the exact EV of fold, bet1 and
+bet3 under optimal play, computed by enumerating the remaining deck. Answers and
+subgame values are memoized in bounded LRU caches keyed by the canonical,
+suit-isomorphic state together with the removed-card signature, so repeated
+situations are answered from cache.
+
+Repeated queries take microseconds, but the first query of a situation is
+enumerated in full: roughly 75 ms for a 2-card hand (about 175 ms with six dead
+cards), 7 ms for a 3-card hand and well under 1 ms for a 4-card hand. Dead
+cards make states that are rarely shared between queries, so services that
+expect many distinct dead-card sets should warm the cache or answer 2-card
+queries in the background.
+"""
+
+import sys
+from itertools import product
+
+from config import ADVICE_CONFIG, DEFAULT_BET
+from utils.cards import parse_cards
+from utils.exact_ev import ACTIONS, BET_SIZES, ExactEVCalculator, canonical_state
+from utils.lru_cache import LRUCache
+
+
+class Advisor:
+    """
+    Answers exact-EV queries for partial hands, singly or in batches.
+    """
+
+    def __init__(self, cache_size=None):
+        """
+        Initialize the advisor.
+        Args:
+            cache_size (int): Maximum entries per cache. Defaults to ADVICE_CONFIG['cache_size'].
+        """
+        cache_size = cache_size or ADVICE_CONFIG['cache_size']
+        self.calculator = ExactEVCalculator(cache_size)
+        self._answers = LRUCache(cache_size)
+
+    def query(self, hand, dead_cards=(), committed=None):
+        """
+        Exact EV of each action for a partial hand.
+        A cold query enumerates the rest of the deal (tens of milliseconds for a
+        2-card hand); repeated situations are answered from cache.
+        Args:
+            hand (list): The player's 2, 3 or 4 deuces cards.
+            dead_cards (list): Cards seen at other seats, known to be out of the deck.
+            committed (int): Total amount already wagered. Defaults to the ante plus
+                a 1x bet on each earlier street.
+        Returns:
+            dict: EVs of 'fold', 'bet1' and 'bet3', and the 'best' action.
+        """
+        key = self._query_key(hand, dead_cards, committed)
+        return dict(self._answer(key))
+
+    def query_batch(self, queries):
+        """
+        Answer many queries in one call.
+        Queries are validated and canonicalized first, and each distinct situation
+        is computed once however often it appears in the batch.
+        Args:
+            queries (list): Dicts of query() keyword arguments ('hand', and optionally
+                'dead_cards' and 'committed').
+        Returns:
+            list: The answers, in the order of the queries.
+        """
+        keys = [self._query_key(**query) for query in queries]
+        answers = {key: self._answer(key) for key in dict.fromkeys(keys)}
+        return [dict(answers[key]) for key in keys]
+
+    def _query_key(self, hand, dead_cards=(), committed=None):
+        """Validate a query and build its cache key."""
+        if not 2 <= len(hand) <= 4:
+            raise ValueError(f"Expected a 2, 3 or 4 card hand, got {len(hand)} cards")
+        if len(set(hand) | set(dead_cards)) != len(hand) + len(dead_cards):
+            raise ValueError("Hand and dead cards must not contain duplicate cards")
+        remaining = 52 - len(hand) - len(dead_cards)
+        if remaining < 5 - len(hand):
+            raise ValueError(f"{remaining} cards left in the deck, need {5 - len(hand)} to finish the hand")
+        reachable = _reachable_wagers(len(hand))
+        if committed is None:
+            committed = DEFAULT_BET + len(hand) - 2
+        elif committed not in reachable:
+            raise ValueError(f"A {len(hand)}-card hand has {sorted(reachable)} wagered, not {committed}")
+        return canonical_state(hand, dead_cards), committed
+
+    def _answer(self, key):
+        """The cached answer for a key; callers must copy it before returning it."""
+        answer = self._answers.get(key)
+        if answer is None:
+            answer = dict(self.calculator.state_action_evs(*key))
+            answer['best'] = max(ACTIONS, key=answer.__getitem__)
+            self._answers[key] = answer
+        return answer
+
+
+def _reachable_wagers(hand_size):
+    """Amounts that can be wagered before the step of a hand_size-card hand."""
+    return {DEFAULT_BET + sum(bets) for bets in product(BET_SIZES.values(), repeat=hand_size - 2)}
+
+
+if __name__ == "__main__":
+    if not 2 <= len(sys.argv) <= 3:
+        print(f'Usage: {sys.argv[0]} "HAND CARDS" ["DEAD CARDS"]')
+        sys.exit(1)
+    advice = Advisor().query(parse_cards(sys.argv[1]), parse_cards(sys.argv[2]) if len(sys.argv) == 3 else ())
+    for action in ACTIONS:
+        print(f"{action}: {advice[action]:.5f}")
+    print(f"Best action: {advice['best']}")
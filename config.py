@@ -63,3 +63,65 @@ SIMULATION_CONFIG = {
     'show_each_hand': False,
     'verbose_output': True
 }
+
+# Hand-history regret analysis defaults
+REGRET_CONFIG = {
+    'chunk_size': 10000,         # Hand histories read from disk per chunk
+    'top_situations': 20         # Costliest situations listed in the report
+}
+
+# Stratified simulation defaults
+STRATIFIED_CONFIG = {
+    'pilot_hands': 30,           # Hands per non-folding starting hand before Neyman allocation
+    'allocation_rounds': 10      # Rounds over which the remaining budget is allocated
+}
+
+# Distributed simulation defaults
+DISTRIBUTED_CONFIG = {
+    'host': '127.0.0.1',
+    'port': 5757,
+    'unit_hands': 1000,          # Hands per work unit handed to a worker
+    'lease_timeout': 600,        # Seconds before an unfinished unit is reassigned
+    'poll_interval': 0.5         # Seconds an idle worker waits before asking again
+}
+
+# Side bet payout tables (net multipliers of the side wager; anything else loses it)
+SIDE_BET_PAYOUTS = {
+    'three_card_bonus': {
+        'mini_royal': 50,        # A-K-Q suited
+        'straight_flush': 40,
+        'three_of_a_kind': 30,
+        'straight': 6,
+        'flush': 3,
+        'pair': 1
+    }
+}
+
+# Decision advice defaults
+ADVICE_CONFIG = {
+    'cache_size': 500000         # Maximum memoized states per cache
+}
+
+# Conformance harness defaults
+CONFORMANCE_CONFIG = {
+    'seed': 20240601,            # Fixed seed for every sampled engine
+    'ev_error': 0.0005,          # EV error per hand the sample size is chosen to detect
+    'alpha': 0.001,              # Significance level of each test
+    'power': 0.9,                # Power against an EV error of ev_error
+    'max_hands': 20000,          # Cap on hands per engine so the suite stays cheap
+    'symmetry_deals': 2000       # Random deals used to check strategies are suit-symmetric
+}
+
+# Control-variate simulation defaults
+CONTROL_VARIATE_CONFIG = {
+    'seed': 1,
+    'fold_controls': True,               # Also use the exact step-1 and step-2 fold rates
+    'baseline_category': 'high_card'     # Category left out, since the categories sum to one
+}
+
+# Results archive defaults
+RESULTS_ARCHIVE_CONFIG = {
+    'path': 'results_archive.sqlite3',   # SQLite file holding the stored runs
+    'unit_hands': 1000,                  # Hands per seeded unit; runs grow a whole unit at a time
+    'seed': 0
+}
@@ -0,0 +1,377 @@
+"""
+Conformance harness for the Mississippi Stud simulation engines.
+
+For every built-in strategy the exact payout distribution is derived by full
+enumeration of the deal (over suit-isomorphic states, weighted by the number of
+ordered deals each one stands for). The reference engine, simulate_hand(), is
+run at a fixed seed; its payout counts and its outcome-category counts are each
+checked against the exact distribution with a chi-square test, and its mean
+payout with a z-test. The stratified engine (stratified_sim.simulate_stratified())
+samples differently, so its EV is checked with a z-test.
+
+Engines that deal the same hands as the reference must match it exactly: the
+shared-table engine (utils.shared_tables) at the same seed, and every
+distributed_sim.simulate_unit() work unit at its own unit seed, with the units
+merging to identical results in any order.
+
+The exact engine (ExactEVCalculator) must agree with the enumerated EV of
+ExactStrategy. Strategies are also checked on random deals to depend only on
+the cards up to a relabelling of suits, which the enumeration relies on and
+which breaks if rank or suit decoding depends on the card encoding.
+
+Sample sizes are the number of hands needed to detect an EV error of
+CONFORMANCE_CONFIG['ev_error'], capped at CONFORMANCE_CONFIG['max_hands'];
+when the cap applies, the EV error actually detectable is printed as a warning.
+
+Exits with status 1 if any check fails.
+"""
+
+import math
+import random
+import sys
+from fractions import Fraction
+from statistics import NormalDist
+
+from deuces import Card
+from config import CONFORMANCE_CONFIG, DEFAULT_BET, DISTRIBUTED_CONFIG
+import distributed_sim
+import mississippi_stud_sim as sim
+import stratified_sim
+from strategies import TableStrategy
+from utils.cards import full_deck
+from utils.enumeration import replay_decisions, representative_hand, two_card_states
+from utils.exact_ev import (BET_SIZES, ExactEVCalculator, canonical_state, deal_one,
+                            remaining_cards, state_cards)
+from utils.payouts import OUTCOME_PAYOUTS, classify_hand
+from utils.shared_tables import SharedTables
+
+# Ordered 5-card deals from a 52-card deck
+TOTAL_DEALS = 52 * 51 * 50 * 49 * 48
+# Ordered ways to deal the remaining cards after a fold at 2, 3 or 4 cards
+_DEALS_AFTER = {2: 50 * 49 * 48, 3: 49 * 48, 4: 48}
+
+_showdown_cache = {}
+
+
+def _showdown_outcomes(key):
+    """Outcome counts of a 4-card state over every possible fifth card."""
+    outcomes = _showdown_cache.get(key)
+    if outcomes is None:
+        known, dead = state_cards(key)
+        outcomes = {}
+        for card in remaining_cards(known, dead):
+            cards = known + [card]
+            outcome = classify_hand([r for r, _ in cards], [s for _, s in cards])
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+        _showdown_cache[key] = outcomes
+    return outcomes
+
+
+def exact_counts(strategy):
+    """
+    Enumerate every ordered 5-card deal and count the hand payouts and outcomes of a strategy.
+    Strategies are called step by step on representative hands of each
+    suit-isomorphic state, so they must depend only on the cards up to a
+    relabelling of suits (see check_symmetry()).
+    Args:
+        strategy: A strategy instance.
+    Returns:
+        tuple: (payout counts, outcome counts), each a mapping to a number of ordered
+            deals summing to TOTAL_DEALS. Folds count as 'loss', as in simulate_hand().
+    """
+    counts = {}
+    outcomes = {}
+
+    def add(payout, weight, outcome='loss'):
+        counts[payout] = counts.get(payout, 0) + weight
+        outcomes[outcome] = outcomes.get(outcome, 0) + weight
+
+    for key2, weight2 in two_card_states().items():
+        hand2 = representative_hand(key2)
+        action1 = replay_decisions(strategy, [hand2])[0]
+        if action1 == 'fold':
+            add(-DEFAULT_BET, weight2 * _DEALS_AFTER[2])
+            continue
+        for key3, count3 in deal_one(key2):
+            hand3 = representative_hand(key3)
+            actions = replay_decisions(strategy, [hand2, hand3])
+            bet = DEFAULT_BET + BET_SIZES[action1]
+            weight3 = weight2 * count3
+            if actions[-1] == 'fold':
+                add(-bet, weight3 * _DEALS_AFTER[3])
+                continue
+            bet += BET_SIZES[actions[1]]
+            for key4, count4 in deal_one(key3):
+                actions = replay_decisions(strategy, [hand2, hand3, representative_hand(key4)])
+                weight4 = weight3 * count4
+                if actions[-1] == 'fold':
+                    add(-bet, weight4 * _DEALS_AFTER[4])
+                    continue
+                total_bet = bet + BET_SIZES[actions[2]]
+                for outcome, count in _showdown_outcomes(key4).items():
+                    add(OUTCOME_PAYOUTS[outcome] * total_bet, weight4 * count, outcome)
+    return counts, outcomes
+
+
+def exact_payout_counts(strategy):
+    """
+    Exact payout distribution of a strategy (see exact_counts()).
+    Returns:
+        dict: Mapping of net payout to number of ordered deals; sums to TOTAL_DEALS.
+    """
+    return exact_counts(strategy)[0]
+
+
+def distribution_moments(counts):
+    """
+    Exact mean and variance of a payout distribution.
+    Returns:
+        tuple: (mean, variance) as Fractions.
+    """
+    total = sum(counts.values())
+    mean = Fraction(sum(payout * count for payout, count in counts.items()), total)
+    second = Fraction(sum(payout * payout * count for payout, count in counts.items()), total)
+    return mean, second - mean * mean
+
+
+def required_hands(variance, ev_error, alpha, power):
+    """
+    Hands needed for a two-sided z-test at level alpha to detect an EV error with the given power.
+    """
+    z = NormalDist().inv_cdf(1 - alpha / 2) + NormalDist().inv_cdf(power)
+    return math.ceil((z * math.sqrt(variance) / ev_error) ** 2)
+
+
+def detectable_error(variance, hands, alpha, power):
+    """
+    Smallest EV error a z-test on the given number of hands detects with the given power.
+    """
+    z = NormalDist().inv_cdf(1 - alpha / 2) + NormalDist().inv_cdf(power)
+    return z * math.sqrt(variance / hands)
+
+
+def _regularized_gamma_q(a, x):
+    """Upper regularized incomplete gamma function Q(a, x)."""
+    if x <= 0:
+        return 1.0
+    log_prefix = a * math.log(x) - x - math.lgamma(a)
+    if x < a + 1:
+        # Series for the lower function P(a, x)
+        term = total = 1.0 / a
+        n = a
+        while abs(term) > abs(total) * 1e-15:
+            n += 1
+            term *= x / n
+            total += term
+        return 1.0 - total * math.exp(log_prefix)
+    # Continued fraction for Q(a, x) (modified Lentz)
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    h = d
+    for i in range(1, 1000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15:
+            break
+    return math.exp(log_prefix) * h
+
+
+def chi_square_test(observed, counts):
+    """
+    Chi-square goodness-of-fit of observed counts against an exact distribution.
+    Bins (payouts or outcome categories) expected fewer than 5 times are pooled into one bin.
+    Args:
+        observed (dict): Mapping of bin to observed count.
+        counts (dict): Exact mapping of bin to number of deals.
+    Returns:
+        tuple: (statistic, degrees of freedom, p-value).
+    """
+    unexpected = {key for key, count in observed.items() if count} - set(counts)
+    if unexpected:
+        return math.inf, 0, 0.0
+    n = sum(observed.values())
+    total = sum(counts.values())
+    bins = []
+    pooled_expected = pooled_observed = 0.0
+    for payout, count in counts.items():
+        expected = n * count / total
+        if expected < 5:
+            pooled_expected += expected
+            pooled_observed += observed.get(payout, 0)
+        else:
+            bins.append([expected, observed.get(payout, 0)])
+    if pooled_expected > 0:
+        if pooled_expected < 5 and bins:
+            smallest = min(bins)
+            smallest[0] += pooled_expected
+            smallest[1] += pooled_observed
+        else:
+            bins.append([pooled_expected, pooled_observed])
+    statistic = sum((obs - exp) ** 2 / exp for exp, obs in bins)
+    dof = len(bins) - 1
+    if dof < 1:
+        return statistic, dof, 1.0
+    return statistic, dof, _regularized_gamma_q(dof / 2, statistic / 2)
+
+
+def z_test(mean, expected, std_error):
+    """
+    Two-sided z-test of an estimated mean against its exact value.
+    Returns:
+        tuple: (z, p-value).
+    """
+    if std_error == 0:
+        return 0.0, 1.0 if mean == expected else 0.0
+    z = (mean - expected) / std_error
+    return z, math.erfc(abs(z) / math.sqrt(2))
+
+
+def check_symmetry(strategy, deals, seed):
+    """
+    Check that a strategy decides the same on random deals as on their canonical representatives.
+    Returns:
+        str: None if every deal agrees, otherwise a description of the first mismatch.
+    """
+    rng = random.Random(seed)
+    deck = full_deck()
+    for _ in range(deals):
+        cards = rng.sample(deck, 4)
+        real = replay_decisions(strategy, [cards[:2], cards[:3], cards[:4]])
+        canonical = replay_decisions(strategy, [representative_hand(canonical_state(cards[:n])) for n in (2, 3, 4)])
+        if real != canonical:
+            return f"decisions {real} on {' '.join(Card.int_to_str(c) for c in cards)} differ from canonical {canonical}"
+    return None
+
+
+def _histogram_moments(histogram):
+    n = sum(histogram.values())
+    mean = sum(payout * count for payout, count in histogram.items()) / n
+    variance = sum(payout * payout * count for payout, count in histogram.items()) / n - mean * mean
+    return n, mean, math.sqrt(max(variance, 0.0) / n)
+
+
+def _run_engine(strategy, hands, seed, tables=None):
+    """Payout histogram and outcome counts of simulate_hand() at a seed."""
+    random.seed(seed)
+    for k in sim.hand_class_counter:
+        sim.hand_class_counter[k] = 0
+    histogram = {}
+    for _ in range(hands):
+        payout, _ = sim.simulate_hand(strategy=strategy, tables=tables)
+        histogram[payout] = histogram.get(payout, 0) + 1
+    return histogram, dict(sim.hand_class_counter)
+
+
+def _run_reference(strategy_name, hands, seed):
+    return _run_engine(sim.get_strategy(strategy_name), hands, seed)
+
+
+def _run_tables(tables, strategy_name, hands, seed):
+    return _run_engine(TableStrategy(tables.decision_table(strategy_name)), hands, seed, tables)
+
+
+def check_distributed(strategy_name, hands, seed):
+    """
+    Check distributed work units against the reference engine at each unit's seed,
+    and that merging them does not depend on the order.
+    Returns:
+        str: None if every unit matches, otherwise a description of the first mismatch.
+    """
+    unit_hands = DISTRIBUTED_CONFIG['unit_hands']
+    units = []
+    for index, start in enumerate(range(0, hands, unit_hands)):
+        unit_size = min(unit_hands, hands - start)
+        unit = distributed_sim.simulate_unit(strategy_name, seed, index, unit_size)
+        reference = _run_reference(strategy_name, unit_size, f"{seed}-{index}")
+        if (unit['payout_histogram'], unit['outcomes']) != reference:
+            return f"unit {index} differs from the reference engine at seed '{seed}-{index}'"
+        units.append(unit)
+    forward = distributed_sim.empty_result()
+    for unit in units:
+        forward = distributed_sim.merge_results(forward, unit)
+    backward = distributed_sim.empty_result()
+    for unit in reversed(units):
+        backward = distributed_sim.merge_results(unit, backward)
+    return None if forward == backward else "forward and reverse merge orders differ"
+
+
+def run_conformance(strategy_names=None, config=None):
+    """
+    Run every conformance check and print one line per check.
+    Args:
+        strategy_names (list): Strategies to check. Defaults to all of STRATEGIES.
+        config (dict): Harness settings. Defaults to CONFORMANCE_CONFIG.
+    Returns:
+        bool: True if every check passed.
+    """
+    config = config or CONFORMANCE_CONFIG
+    seed, alpha = config['seed'], config['alpha']
+    failures = 0
+
+    def report(name, passed, detail):
+        nonlocal failures
+        failures += not passed
+        print(f"  [{'PASS' if passed else 'FAIL'}] {name}: {detail}")
+
+    for strategy_name in strategy_names or list(sim.STRATEGIES):
+        strategy = sim.get_strategy(strategy_name)
+        print(f"Strategy '{strategy_name}':")
+        asymmetry = check_symmetry(strategy, config['symmetry_deals'], seed)
+        report('suit symmetry', asymmetry is None, asymmetry or f"{config['symmetry_deals']} random deals agree")
+        if asymmetry:
+            continue
+
+        counts, outcome_counts = exact_counts(strategy)
+        ev, variance = distribution_moments(counts)
+        needed = required_hands(float(variance), config['ev_error'], alpha, config['power'])
+        hands = min(needed, config['max_hands'])
+        print(f"  exact EV {float(ev):.6f}, sd {math.sqrt(variance):.4f}; running {hands} hands")
+        if hands < needed:
+            print(f"  [WARN] power: capped at {hands} hands, so the z-tests only detect EV errors of "
+                  f"{detectable_error(float(variance), hands, alpha, config['power']):.4f} "
+                  f"(detecting {config['ev_error']} needs {needed} hands)")
+
+        if strategy_name == 'exact':
+            calculator = ExactEVCalculator()
+            states = two_card_states()
+            game_value = sum(weight * max(calculator.state_action_evs(key, DEFAULT_BET).values())
+                             for key, weight in states.items()) / sum(states.values())
+            report('exact engine', math.isclose(game_value, float(ev), rel_tol=1e-12, abs_tol=1e-12),
+                   f"calculator {game_value:.12f} vs enumeration {float(ev):.12f}")
+
+        histogram, outcomes = reference = _run_reference(strategy_name, hands, seed)
+        statistic, dof, p_value = chi_square_test(histogram, counts)
+        report('reference payout chi-square', p_value >= alpha, f"chi2={statistic:.2f}, dof={dof}, p={p_value:.4f}")
+        statistic, dof, p_value = chi_square_test(outcomes, outcome_counts)
+        report('reference outcome chi-square', p_value >= alpha, f"chi2={statistic:.2f}, dof={dof}, p={p_value:.4f}")
+        n, mean, std_error = _histogram_moments(histogram)
+        z, p_value = z_test(mean, float(ev), std_error)
+        report('reference z-test', p_value >= alpha, f"EV {mean:.5f}, z={z:.2f}, p={p_value:.4f}")
+
+        with SharedTables.create({strategy_name: strategy}) as tables:
+            shared = _run_tables(tables, strategy_name, hands, seed)
+        report('shared tables', shared == reference, "identical to reference at the same seed")
+        mismatch = check_distributed(strategy_name, hands, seed)
+        report('distributed units', mismatch is None,
+               mismatch or "identical to reference at each unit's seed, in any merge order")
+
+        random.seed(seed)
+        stratified = stratified_sim.simulate_stratified(hands, strategy_name, verbose=False)
+        z, p_value = z_test(stratified['ev'], float(ev), stratified['std_error'])
+        report('stratified z-test', p_value >= alpha, f"EV {stratified['ev']:.5f}, z={z:.2f}, p={p_value:.4f}")
+
+    print(f"{failures} check(s) failed." if failures else "All checks passed.")
+    return failures == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_conformance(sys.argv[1:] or None) else 1)
@@ -0,0 +1,191 @@
+"""
+Control-variate Mississippi Stud simulation.
+
+Every simulated deal is completed to five cards (cards the player never saw
+after a fold are dealt lazily, as for side bets), and the category of that
+5-card deal is recorded alongside the hand payout. Category frequencies have
+known combinatorial probabilities, and so do the strategy's fold rates at
+steps 1 and 2, which are enumerated exactly. Using these as control variates
+(a regression estimator) removes the part of the payout variance they explain.
+"""
+
+import math
+import random
+from collections import Counter
+from itertools import combinations_with_replacement
+
+from config import CONTROL_VARIATE_CONFIG
+from mississippi_stud_sim import get_strategy, simulate_hand
+from utils.cards import card_rank, card_suit
+from utils.enumeration import replay_decisions, representative_hand, two_card_states
+from utils.exact_ev import deal_one
+from utils.payouts import classify_hand
+
+# Controls: hand_result strings of the folds whose rates are enumerated exactly
+FOLD_RESULTS = {'fold_step_1': 'folded pre-flop', 'fold_step_2': 'folded after 3rd card'}
+
+
+def exact_category_probabilities():
+    """
+    Exact probability of each classify_hand() category for a random 5-card deal.
+    Returns:
+        dict: Mapping of category to probability.
+    """
+    counts = Counter()
+    for ranks in combinations_with_replacement(range(13), 5):
+        rank_counts = Counter(ranks)
+        if max(rank_counts.values()) > 4:
+            continue
+        suitings = 1
+        for count in rank_counts.values():
+            suitings *= math.comb(4, count)
+        if len(rank_counts) == 5:
+            counts[classify_hand(list(ranks), [0] * 5)] += 4
+            suitings -= 4
+        counts[classify_hand(list(ranks), [0, 1, 2, 3, 0])] += suitings
+    total = math.comb(52, 5)
+    return {category: count / total for category, count in counts.items()}
+
+
+def exact_fold_probabilities(strategy):
+    """
+    Exact probability that a strategy folds at step 1 and at step 2.
+    Every deal is replayed from step 1 over suit-isomorphic states, so strategies
+    that track the current hand decide with the right wager; they must depend
+    only on the cards up to a relabelling of suits.
+    Returns:
+        dict: Mapping of 'fold_step_1' and 'fold_step_2' to probability.
+    """
+    fold_1 = fold_2 = 0
+    for key2, weight2 in two_card_states().items():
+        hand2 = representative_hand(key2)
+        if replay_decisions(strategy, [hand2])[0] == 'fold':
+            fold_1 += weight2 * 50
+            continue
+        for key3, count3 in deal_one(key2):
+            if replay_decisions(strategy, [hand2, representative_hand(key3)])[-1] == 'fold':
+                fold_2 += weight2 * count3
+    deals = 52 * 51 * 50
+    return {'fold_step_1': fold_1 / deals, 'fold_step_2': fold_2 / deals}
+
+
+class _DealRecorder:
+    """Settled like a side bet on all five cards, so the rest of the deal is drawn lazily."""
+
+    cards_needed = 5
+
+    def __init__(self):
+        self.category = None
+
+    def settle(self, cards):
+        self.category = classify_hand([card_rank(c) for c in cards], [card_suit(c) for c in cards])
+
+
+def _solve(matrix, vector):
+    """
+    Solve a symmetric linear system by Gaussian elimination with partial pivoting.
+    Directions with a negligible pivot (controls that never varied, or collinear
+    ones) get a zero coefficient.
+    """
+    size = len(vector)
+    a = [row[:] + [vector[i]] for i, row in enumerate(matrix)]
+    scale = max((abs(a[i][i]) for i in range(size)), default=0.0) or 1.0
+    pivots = []
+    row = 0
+    for col in range(size):
+        best = max(range(row, size), key=lambda r: abs(a[r][col]), default=None)
+        if best is None or abs(a[best][col]) <= 1e-12 * scale:
+            continue
+        a[row], a[best] = a[best], a[row]
+        for r in range(size):
+            if r != row and a[r][col]:
+                factor = a[r][col] / a[row][col]
+                a[r] = [x - factor * y for x, y in zip(a[r], a[row])]
+        pivots.append((row, col))
+        row += 1
+    solution = [0.0] * size
+    for r, col in pivots:
+        solution[col] = a[r][size] / a[r][col]
+    return solution
+
+
+def simulate_control_variates(number_of_hands, strategy_name='point', verbose=True):
+    """
+    Estimate a strategy's EV per hand with and without control variates.
+    Args:
+        number_of_hands (int): The number of hands to simulate.
+        strategy_name (str): Name of the strategy to use.
+        verbose (bool): If True, print the estimates.
+    Returns:
+        dict: 'hands', the raw 'ev' and 'std_error', the variance-reduced 'cv_ev'
+            and 'cv_std_error', the 'variance_reduction' factor (the effective
+            sample-size gain) and the 'controls' used with their exact means.
+    """
+    if number_of_hands < 2:
+        raise ValueError("Need at least 2 hands to estimate a standard error")
+    strategy = get_strategy(strategy_name)
+    means = exact_category_probabilities()
+    if CONTROL_VARIATE_CONFIG['fold_controls']:
+        means.update(exact_fold_probabilities(strategy))
+    # The categories sum to one, so one of them is redundant
+    means.pop(CONTROL_VARIATE_CONFIG['baseline_category'])
+    controls = list(means)
+
+    # Running sums of the payout, the centred controls and their products, so
+    # memory does not grow with the number of hands
+    k = len(controls)
+    recorder = _DealRecorder()
+    sum_y = sum_yy = 0.0
+    sum_x = [0.0] * k
+    sum_xy = [0.0] * k
+    sum_xx = [[0.0] * k for _ in range(k)]
+    for _ in range(number_of_hands):
+        payout, hand_result = simulate_hand(strategy=strategy, side_bets=[recorder])
+        row = [(1.0 if control == recorder.category or FOLD_RESULTS.get(control) == hand_result else 0.0)
+               - means[control] for control in controls]
+        sum_y += payout
+        sum_yy += payout * payout
+        for i, x in enumerate(row):
+            sum_x[i] += x
+            sum_xy[i] += x * payout
+            sums = sum_xx[i]
+            for j in range(i, k):
+                sums[j] += x * row[j]
+
+    n = number_of_hands
+    mean_payout = sum_y / n
+    payout_ss = sum_yy - n * mean_payout * mean_payout
+    raw_variance = payout_ss / (n - 1)
+    column_means = [total / n for total in sum_x]
+    covariance = [[0.0] * k for _ in range(k)]
+    for i in range(k):
+        for j in range(i, k):
+            covariance[i][j] = covariance[j][i] = sum_xx[i][j] - n * column_means[i] * column_means[j]
+    cross = [sum_xy[i] - n * column_means[i] * mean_payout for i in range(k)]
+    beta = _solve(covariance, cross)
+
+    # Controls are centred on their exact means, so their expected value is zero
+    cv_ev = mean_payout - sum(b * m for b, m in zip(beta, column_means))
+    used = sum(1 for b in beta if b)
+    residual_ss = max(payout_ss - sum(b * c for b, c in zip(beta, cross)), 0.0)
+    cv_variance = residual_ss / max(n - used - 1, 1)
+    result = {
+        'hands': n,
+        'ev': mean_payout,
+        'std_error': math.sqrt(raw_variance / n),
+        'cv_ev': cv_ev,
+        'cv_std_error': math.sqrt(cv_variance / n),
+        'variance_reduction': raw_variance / cv_variance if cv_variance else math.inf,
+        'controls': {control: means[control] for control, b in zip(controls, beta) if b},
+    }
+    if verbose:
+        print(f"Simulated {n} hands with {used} control variates.")
+        print(f"Raw EV per hand: {result['ev']:.5f} +/- {result['std_error']:.5f}")
+        print(f"Control-variate EV per hand: {result['cv_ev']:.5f} +/- {result['cv_std_error']:.5f}")
+        print(f"Effective sample-size gain: {result['variance_reduction']:.2f}x")
+    return result
+
+
+if __name__ == "__main__":
+    random.seed(CONTROL_VARIATE_CONFIG['seed'])
+    simulate_control_variates(20000, strategy_name='point')
@@ -0,0 +1,395 @@
+"""
+Distributed Mississippi Stud simulation with a coordinator and TCP workers.
+
+The coordinator splits a run into seed-range work units. Workers on any host
+connect over TCP, pull units, simulate them and return mergeable partial
+results (counters, payout sums and a payout histogram). Units held by a worker
+that disconnects, or whose lease expires, are handed to another worker. Every
+unit is seeded from the run seed and its index, so the merged result does not
+depend on which worker ran which unit or in what order.
+
+Messages are newline-delimited JSON; no external broker is needed. Units and
+results carry the strategy name and ENGINE_VERSION, so a worker running other
+engine code is turned away instead of merging into the run.
+
+Usage:
+    python distributed_sim.py coordinator HANDS [--strategy point] [--seed 0]
+    python distributed_sim.py worker [--host 127.0.0.1] [--port 5757]
+    python distributed_sim.py local HANDS --workers 4
+"""
+
+import argparse
+import json
+import multiprocessing
+import random
+import socket
+import socketserver
+import threading
+import time
+from collections import deque
+
+from config import DISTRIBUTED_CONFIG, HAND_OUTCOMES
+import mississippi_stud_sim as sim
+from strategies import TableStrategy
+from utils.shared_tables import SharedTables
+
+
+def empty_result():
+    """
+    An empty partial result, the identity for merge_results().
+    """
+    return {
+        'hands': 0,
+        'total_payout': 0,
+        'total_payout_sq': 0,
+        'outcomes': {outcome: 0 for outcome in HAND_OUTCOMES},
+        'payout_histogram': {},
+    }
+
+
+def merge_results(a, b):
+    """
+    Merge two partial results into a new one.
+    Args:
+        a (dict): A partial result.
+        b (dict): Another partial result.
+    Returns:
+        dict: The combined result.
+    """
+    merged = empty_result()
+    for part in (a, b):
+        merged['hands'] += part['hands']
+        merged['total_payout'] += part['total_payout']
+        merged['total_payout_sq'] += part['total_payout_sq']
+        for outcome, count in part['outcomes'].items():
+            merged['outcomes'][outcome] = merged['outcomes'].get(outcome, 0) + count
+        for payout, count in part['payout_histogram'].items():
+            merged['payout_histogram'][payout] = merged['payout_histogram'].get(payout, 0) + count
+    merged['payout_histogram'] = dict(sorted(merged['payout_histogram'].items()))
+    return merged
+
+
+def simulate_unit(strategy_name, seed, unit_index, hands, tables=None):
+    """
+    Simulate one work unit.
+    The unit is seeded from the run seed and its index, so it produces the same
+    partial result on any worker.
+    Args:
+        strategy_name (str): Name of the strategy to use.
+        seed (int): The run seed.
+        unit_index (int): Index of the unit within the run.
+        hands (int): Number of hands in the unit.
+        tables (SharedTables): Optional shared lookup tables; the strategy's decisions
+            are read from them when they include it.
+    Returns:
+        dict: The unit's partial result.
+    """
+    random.seed(f"{seed}-{unit_index}")
+    for k in sim.hand_class_counter:
+        sim.hand_class_counter[k] = 0
+    if tables is not None and strategy_name in tables:
+        strategy = TableStrategy(tables.decision_table(strategy_name))
+    else:
+        strategy = sim.get_strategy(strategy_name)
+    result = empty_result()
+    histogram = result['payout_histogram']
+    for _ in range(hands):
+        payout, _ = sim.simulate_hand(strategy=strategy, tables=tables)
+        result['total_payout'] += payout
+        result['total_payout_sq'] += payout * payout
+        histogram[payout] = histogram.get(payout, 0) + 1
+    result['hands'] = hands
+    result['outcomes'] = dict(sim.hand_class_counter)
+    return result
+
+
+def _send(stream, message):
+    stream.write(json.dumps(message).encode() + b'\n')
+    stream.flush()
+
+
+def _receive(stream):
+    line = stream.readline()
+    if not line:
+        raise ConnectionError("Connection closed")
+    return json.loads(line)
+
+
+def _encode_result(result):
+    # JSON object keys are strings, so the histogram travels as [payout, count] pairs
+    return dict(result, payout_histogram=sorted(result['payout_histogram'].items()))
+
+
+def _decode_result(result):
+    return dict(result, payout_histogram={payout: count for payout, count in result['payout_histogram']})
+
+
+class _WorkerServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class Coordinator:
+    """
+    Hands out work units to TCP workers and merges their partial results.
+    """
+
+    def __init__(self, number_of_hands, strategy_name='point', seed=0, unit_hands=None,
+                 host=None, port=None, lease_timeout=None):
+        """
+        Initialize the coordinator and bind its listening socket.
+        Args:
+            number_of_hands (int): Total number of hands to simulate.
+            strategy_name (str): Name of the strategy to use.
+            seed (int): The run seed; the merged result depends only on it and the unit layout.
+            unit_hands (int): Hands per work unit.
+            host (str): Interface to listen on.
+            port (int): Port to listen on; 0 picks a free port.
+            lease_timeout (float): Seconds before an unfinished unit is reassigned.
+        """
+        sim.get_strategy(strategy_name)  # fail fast on unknown strategies
+        unit_hands = unit_hands or DISTRIBUTED_CONFIG['unit_hands']
+        self.strategy_name = strategy_name
+        self.seed = seed
+        self.lease_timeout = lease_timeout or DISTRIBUTED_CONFIG['lease_timeout']
+        self.units = []
+        for start in range(0, number_of_hands, unit_hands):
+            self.units.append(min(unit_hands, number_of_hands - start))
+        self._pending = deque(range(len(self.units)))
+        self._leases = {}  # unit index -> (worker id, expiry time)
+        self._results = {}
+        self._lock = threading.Lock()
+        self._finished = threading.Event()
+        if not self.units:
+            self._finished.set()
+
+        coordinator = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                coordinator._serve_worker(self.rfile, self.wfile, id(self))
+
+        self._server = _WorkerServer(
+            (host or DISTRIBUTED_CONFIG['host'],
+             DISTRIBUTED_CONFIG['port'] if port is None else port),
+            Handler)
+
+    @property
+    def address(self):
+        """The (host, port) the coordinator listens on."""
+        return self._server.server_address
+
+    def run(self):
+        """
+        Serve workers until every unit has a result.
+        Returns:
+            dict: The merged result of all units.
+        """
+        thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            self._finished.wait()
+        finally:
+            self._server.shutdown()
+            self._server.server_close()
+        merged = empty_result()
+        for index in range(len(self.units)):
+            merged = merge_results(merged, self._results[index])
+        return merged
+
+    def _serve_worker(self, rfile, wfile, worker_id):
+        try:
+            while True:
+                message = _receive(rfile)
+                if message['type'] == 'result':
+                    self._complete(worker_id, message)
+                elif message['type'] == 'request':
+                    _send(wfile, self._next_unit(worker_id))
+                else:
+                    raise ValueError(f"Unknown message type: {message['type']}")
+        except (ConnectionError, OSError, ValueError, KeyError, TypeError):
+            # A malformed or mismatched message drops the worker; its leases are reassigned
+            pass
+        finally:
+            self._release(worker_id)
+
+    def _next_unit(self, worker_id):
+        with self._lock:
+            if self._finished.is_set():
+                return {'type': 'done'}
+            now = time.monotonic()
+            for index, (_, expiry) in list(self._leases.items()):
+                if expiry < now:
+                    del self._leases[index]
+                    self._pending.appendleft(index)
+            if not self._pending:
+                return {'type': 'wait'}
+            index = self._pending.popleft()
+            self._leases[index] = (worker_id, now + self.lease_timeout)
+            return {'type': 'unit', 'unit': index, 'strategy': self.strategy_name,
+                    'engine_version': sim.ENGINE_VERSION, 'seed': self.seed, 'hands': self.units[index]}
+
+    def _complete(self, worker_id, message):
+        """
+        Record a worker's result message.
+        Raises ValueError if the message does not belong to this run; results for
+        units not currently leased to the worker (such as a unit reassigned after
+        its lease expired) are ignored.
+        """
+        index = message['unit']
+        if type(index) is not int or not 0 <= index < len(self.units):
+            raise ValueError(f"Unknown unit: {index!r}")
+        if (message['strategy'], message['engine_version'], message['seed']) != (
+                self.strategy_name, sim.ENGINE_VERSION, self.seed):
+            raise ValueError(f"Result for unit {index} is from a different run: strategy "
+                             f"{message['strategy']!r}, engine v{message['engine_version']}, seed {message['seed']!r}")
+        result = _decode_result(message['result'])
+        if result['hands'] != self.units[index]:
+            raise ValueError(f"Unit {index} has {self.units[index]} hands, result has {result['hands']}")
+        with self._lock:
+            owner, _ = self._leases.get(index, (None, None))
+            if owner != worker_id:
+                return
+            del self._leases[index]
+            self._results[index] = result
+            if len(self._results) == len(self.units):
+                self._finished.set()
+
+    def _release(self, worker_id):
+        with self._lock:
+            for index, (owner, _) in list(self._leases.items()):
+                if owner == worker_id:
+                    del self._leases[index]
+                    self._pending.appendleft(index)
+
+
+def run_worker(host=None, port=None, connect_timeout=10.0, tables_spec=None):
+    """
+    Pull and simulate work units from a coordinator until it reports completion.
+    Args:
+        host (str): Coordinator host.
+        port (int): Coordinator port.
+        connect_timeout (float): Seconds to keep retrying the initial connection.
+        tables_spec (tuple): Optional SharedTables.spec of tables built by a parent process.
+    Returns:
+        int: Number of units this worker completed.
+    """
+    tables = SharedTables.attach(tables_spec) if tables_spec else None
+    try:
+        return _pull_units(host, port, connect_timeout, tables)
+    finally:
+        if tables is not None:
+            tables.close()
+
+
+def _pull_units(host, port, connect_timeout, tables):
+    address = (host or DISTRIBUTED_CONFIG['host'], port or DISTRIBUTED_CONFIG['port'])
+    deadline = time.monotonic() + connect_timeout
+    while True:
+        try:
+            sock = socket.create_connection(address)
+            break
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(DISTRIBUTED_CONFIG['poll_interval'])
+    completed = 0
+    try:
+        with sock, sock.makefile('rwb') as stream:
+            while True:
+                _send(stream, {'type': 'request'})
+                message = _receive(stream)
+                if message['type'] == 'done':
+                    break
+                if message['type'] == 'wait':
+                    time.sleep(DISTRIBUTED_CONFIG['poll_interval'])
+                    continue
+                if message['engine_version'] != sim.ENGINE_VERSION:
+                    raise ValueError(f"Coordinator runs engine v{message['engine_version']}, "
+                                     f"this worker v{sim.ENGINE_VERSION}")
+                result = simulate_unit(message['strategy'], message['seed'], message['unit'], message['hands'], tables)
+                _send(stream, {'type': 'result', 'unit': message['unit'], 'strategy': message['strategy'],
+                               'engine_version': sim.ENGINE_VERSION, 'seed': message['seed'],
+                               'result': _encode_result(result)})
+                completed += 1
+    except (ConnectionError, OSError):
+        # The coordinator shuts down as soon as the last result arrives
+        pass
+    return completed
+
+
+def print_results(result):
+    """
+    Print a merged result in the same layout as simulate().
+    """
+    print(f"Simulated {result['hands']} hands.")
+    print(f"Total payout/loss: {result['total_payout']}")
+    print("Hand class frequencies:")
+    for k, v in result['outcomes'].items():
+        print(f"  {k}: {v}")
+
+
+def simulate_local(number_of_hands, workers, strategy_name='point', seed=0, unit_hands=None,
+                   shared_tables=None):
+    """
+    Run a coordinator with several worker processes on localhost.
+    With shared_tables, the outcome and strategy-decision tables are built once
+    in this process and every worker reads them from shared memory. By default
+    that is done only for strategies with precompute_decisions set: building the
+    tables takes about 0.3-1.0 s for point, conservative and optimal, which start
+    deciding in a fresh worker at once, and 5.6 s for exact, which otherwise
+    spends about 4 s warming up in every worker.
+    Args:
+        shared_tables (bool): Force shared tables on or off; None picks by strategy.
+    Returns:
+        dict: The merged result.
+    """
+    coordinator = Coordinator(number_of_hands, strategy_name, seed, unit_hands, host='127.0.0.1', port=0)
+    host, port = coordinator.address
+    strategy = sim.get_strategy(strategy_name)
+    if shared_tables is None:
+        shared_tables = strategy.precompute_decisions
+    tables = SharedTables.create({strategy_name: strategy}) if shared_tables else None
+    tables_spec = tables.spec if tables else None
+    # Spawned workers start empty instead of inheriting this process's memory
+    context = multiprocessing.get_context('spawn')
+    processes = [context.Process(target=run_worker, args=(host, port, 10.0, tables_spec))
+                 for _ in range(workers)]
+    for process in processes:
+        process.start()
+    try:
+        return coordinator.run()
+    finally:
+        for process in processes:
+            process.join()
+        if tables is not None:
+            tables.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Distributed Mississippi Stud simulation")
+    subparsers = parser.add_subparsers(dest='mode', required=True)
+    for mode in ('coordinator', 'local'):
+        mode_parser = subparsers.add_parser(mode)
+        mode_parser.add_argument('hands', type=int)
+        mode_parser.add_argument('--strategy', default='point')
+        mode_parser.add_argument('--seed', type=int, default=0)
+        mode_parser.add_argument('--unit-hands', type=int, default=DISTRIBUTED_CONFIG['unit_hands'])
+    subparsers.choices['coordinator'].add_argument('--host', default=DISTRIBUTED_CONFIG['host'])
+    subparsers.choices['coordinator'].add_argument('--port', type=int, default=DISTRIBUTED_CONFIG['port'])
+    subparsers.choices['local'].add_argument('--workers', type=int, default=multiprocessing.cpu_count())
+    subparsers.choices['local'].add_argument('--shared-tables', dest='shared_tables', action='store_true', default=None)
+    subparsers.choices['local'].add_argument('--no-shared-tables', dest='shared_tables', action='store_false')
+    worker_parser = subparsers.add_parser('worker')
+    worker_parser.add_argument('--host', default=DISTRIBUTED_CONFIG['host'])
+    worker_parser.add_argument('--port', type=int, default=DISTRIBUTED_CONFIG['port'])
+    args = parser.parse_args()
+
+    if args.mode == 'worker':
+        print(f"Completed {run_worker(args.host, args.port)} units.")
+    elif args.mode == 'coordinator':
+        coordinator = Coordinator(args.hands, args.strategy, args.seed, args.unit_hands, args.host, args.port)
+        print_results(coordinator.run())
+    else:
+        print_results(simulate_local(args.hands, args.workers, args.strategy, args.seed, args.unit_hands,
+                                     args.shared_tables))
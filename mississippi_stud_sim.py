@@ -1,13 +1,20 @@
-from deuces import Deck, Evaluator, Card
+from deuces import Deck, Card
 from config import (
-    PAYOUT_TABLE, 
-    ROYAL_FLUSH_PAYOUT,
     DEFAULT_BET, 
     HAND_OUTCOMES, 
     STRATEGY_CONFIG,
     SIMULATION_CONFIG
 )
-from strategies import PointStrategy, ConservativeStrategy, OptimalStrategy
+from strategies import PointStrategy, ConservativeStrategy, OptimalStrategy, ExactStrategy
+from side_bets import ThreeCardBonus
+from utils.cards import card_rank
+from utils.hand_state import HandState
+from utils.payouts import OUTCOME_DESCRIPTIONS, OUTCOME_PAYOUTS
+
+# Version of the hand engine; bump it whenever the same seed would deal or
+# settle hands differently, so archived results are not reused across versions.
+# Strategy code is versioned separately, by results_archive.strategy_hash().
+ENGINE_VERSION = 1
 
 # Global counter for hand class outcomes
 hand_class_counter = {outcome: 0 for outcome in HAND_OUTCOMES}
@@ -23,7 +30,7 @@ def card_points(card):
     Returns:
         int: The point value of the card.
     """
-    rank = card % 13
+    rank = card_rank(card)
     # deuces: 0=2, 1=3, 2=4, 3=5, 4=6, 5=7, 6=8, 7=9, 8=10, 9=J, 10=Q, 11=K, 12=A
     if 4 <= rank <= 8:  # 6-10
         return STRATEGY_CONFIG['card_points']['push_cards']
@@ -36,7 +43,8 @@ def card_points(card):
 STRATEGIES = {
     'point': PointStrategy,
     'conservative': ConservativeStrategy,
-    'optimal': OptimalStrategy
+    'optimal': OptimalStrategy,
+    'exact': ExactStrategy
 }
 
 def get_strategy(strategy_name='point', config=None):
@@ -52,20 +60,64 @@ def get_strategy(strategy_name='point', config=None):
         raise ValueError(f"Unknown strategy: {strategy_name}. Available: {list(STRATEGIES.keys())}")
     return STRATEGIES[strategy_name](config)
 
-def simulate(number_of_hands, show_each_hand=False, strategy_name='point'):
+# Side bet factory - side bets are settled alongside the main wager
+SIDE_BETS = {
+    'three_card_bonus': ThreeCardBonus
+}
+
+def get_side_bet(side_bet_name):
+    """
+    Get a side bet instance by name.
+    Args:
+        side_bet_name (str): Name of the side bet.
+    Returns:
+        Side bet instance.
+    """
+    if side_bet_name not in SIDE_BETS:
+        raise ValueError(f"Unknown side bet: {side_bet_name}. Available: {list(SIDE_BETS.keys())}")
+    return SIDE_BETS[side_bet_name]()
+
+def side_bet_cards(side_bets):
+    """Number of cards from the start of the deal needed to settle every side bet."""
+    return max((side_bet.cards_needed for side_bet in side_bets), default=0)
+
+def settle_side_bets(side_bets, hand, deck, needed=None):
+    """
+    Settle side bets from the cards of a finished hand.
+    If the player folded before a side bet's cards were dealt, the missing cards
+    are drawn from the same deck, so they are the cards the player would have seen.
+    Args:
+        side_bets (list): Side bet instances.
+        hand (list): The cards the player saw.
+        deck (Deck): The deck the hand was dealt from.
+        needed (int): side_bet_cards(side_bets), if already known.
+    """
+    if needed is None:
+        needed = side_bet_cards(side_bets)
+    cards = hand
+    if needed > len(hand):
+        cards = hand + [deck.draw(1) for _ in range(needed - len(hand))]
+    for side_bet in side_bets:
+        side_bet.settle(cards[:side_bet.cards_needed])
+
+def simulate(number_of_hands, show_each_hand=False, strategy_name='point', side_bet_names=()):
     """
     Simulate a given number of hands.
     Args:
         number_of_hands (int): The number of hands to simulate.
         show_each_hand (bool): If True, print the result of each hand.
         strategy_name (str): Name of the strategy to use.
+        side_bet_names (list): Names of side bets to settle alongside the main wager.
     """
     for k in hand_class_counter:
         hand_class_counter[k] = 0
     simulation_payout = 0
     strategy = get_strategy(strategy_name)
+    side_bets = [get_side_bet(name) for name in side_bet_names]
+    needed = side_bet_cards(side_bets)
     for i in range(number_of_hands):
-        payout, hand_result, hand = simulate_hand(strategy=strategy, return_cards=True)
+        payout, hand_result, hand = simulate_hand(strategy=strategy, return_cards=True, side_bets=side_bets,
+                                                  side_bets_needed=needed)
         simulation_payout += payout
         if show_each_hand:
             hand_str = ' '.join(Card.int_to_str(c) for c in hand)
@@ -75,25 +127,52 @@ def simulate(number_of_hands, show_each_hand=False, strategy_name='point'):
     print("Hand class frequencies:")
     for k, v in hand_class_counter.items():
         print(f"  {k}: {v}")
+    for side_bet in side_bets:
+        print(f"Side bet {side_bet.name}: total payout/loss {side_bet.total_payout}, EV {side_bet.ev:.5f}")
+        for k, v in side_bet.outcome_counter.items():
+            print(f"  {k}: {v}")
 
 
-def simulate_hand(strategy=None, return_cards=False):
+def simulate_hand(strategy=None, return_cards=False, start_cards=None, side_bets=None, tables=None,
+                  side_bets_needed=None):
     """
     Simulate a single hand. Always returns (payout, hand_result).
+    If start_cards is given, those two cards are dealt first and removed from the deck.
+    Any side_bets are settled from the same deal; cards the main game never
+    reached are only dealt when a side bet needs them. Callers settling the same
+    side bets every hand can pass side_bets_needed=side_bet_cards(side_bets).
+    The hand is a HandState, so strategies and the showdown read its
+    incrementally kept counts. If tables (utils.shared_tables.SharedTables) is
+    given, the showdown is resolved from its outcome table instead.
     """
     if strategy is None:
         strategy = get_strategy('point')
     
-    bet_amount = DEFAULT_BET
     deck = Deck()
     deck.shuffle()
     # Draw two cards for the hand
-    hand = [deck.draw(1), deck.draw(1)]
+    if start_cards is None:
+        hand = HandState([deck.draw(1), deck.draw(1)])
+    else:
+        hand = HandState(start_cards)
+        deck.cards = [card for card in deck.cards if card not in hand]
+    payout, hand_result = _play_hand(strategy, deck, hand, tables)
+    if side_bets:
+        settle_side_bets(side_bets, hand, deck, side_bets_needed)
+    if return_cards:
+        return payout, hand_result, hand
+    return payout, hand_result
+
+
+def _play_hand(strategy, deck, hand, tables=None):
+    """
+    Play the main wager from the first two cards, drawing further cards from the deck.
+    Returns (payout, hand_result); hand holds every card the player saw.
+    """
+    bet_amount = DEFAULT_BET
     result = strategy.eval_step_1(hand)
     if result == 'fold':
         hand_class_counter['loss'] += 1
-        if return_cards:
-            return -bet_amount, 'folded pre-flop', hand[:2]
         return -bet_amount, 'folded pre-flop'
     elif result == 'bet3':
         bet_amount += 3
@@ -104,8 +183,6 @@ def simulate_hand(strategy=None, return_cards=False):
     result = strategy.eval_step_2(hand)
     if result == 'fold':
         hand_class_counter['loss'] += 1
-        if return_cards:
-            return -bet_amount, 'folded after 3rd card', hand[:3]
         return -bet_amount, 'folded after 3rd card'
     elif result == 'bet3':
         bet_amount += 3
@@ -116,8 +193,6 @@ def simulate_hand(strategy=None, return_cards=False):
     result = strategy.eval_step_3(hand)
     if result == 'fold':
         hand_class_counter['loss'] += 1
-        if return_cards:
-            return -bet_amount, 'folded after 4th card', hand[:4]
         return -bet_amount, 'folded after 4th card'
     elif result == 'bet3':
         bet_amount += 3
@@ -125,75 +200,12 @@ def simulate_hand(strategy=None, return_cards=False):
         bet_amount += 1
     # Draw fifth card and evaluate as a poker hand
     hand.append(deck.draw(1))
-    evaluator = Evaluator()
-    # Mississippi Stud: evaluate all 5 cards as the player's hand, with an empty board
-    score = evaluator.evaluate([], hand)
-    hand_class = evaluator.get_rank_class(score)
-    payout_factor = 0
-    outcome_key = None
-    hand_desc = evaluator.class_to_string(hand_class)
-    
-    if hand_class in PAYOUT_TABLE and hand_class != 9:  # 9 = High Card
-        # Check for Royal Flush (score=1 within Straight Flush class)
-        if hand_class == 1 and score == 1:
-            payout_factor = ROYAL_FLUSH_PAYOUT
-            outcome_key = 'royal_flush'
-        elif hand_class == 8:  # One Pair - check rank for payout eligibility
-            ranks = [card % 13 for card in hand]
-            rank_counts = {r: ranks.count(r) for r in set(ranks)}
-            pair_rank = [r for r, c in rank_counts.items() if c == 2]
-            if pair_rank and pair_rank[0] >= STRATEGY_CONFIG['min_high_pair_rank']:
-                # Jacks or better - pays
-                payout_factor = PAYOUT_TABLE[8]
-                outcome_key = 'pair_jacks_or_better'
-                hand_desc = 'Pair Jacks or Better'
-            elif pair_rank and STRATEGY_CONFIG['min_push_pair_rank'] <= pair_rank[0] <= 8:
-                # Push pair (6-10) - no payout but no loss
-                outcome_key = 'pair_6_to_10'
-                hand_class_counter[outcome_key] += 1
-                if return_cards:
-                    return 0, 'Pair 6 to 10', hand
-                return 0, 'Pair 6 to 10'
-            else:
-                # Lower pairs (2-5) - loss
-                outcome_key = 'loss'
-                hand_class_counter[outcome_key] += 1
-                if return_cards:
-                    return -bet_amount, 'loss (pair 2-5)', hand
-                return -bet_amount, 'loss (pair 2-5)'
-        else:
-            # All other paying hands
-            payout_factor = PAYOUT_TABLE.get(hand_class, 0)
-            hand_class_to_outcome = {
-                1: 'straight_flush',
-                2: 'four_of_a_kind',
-                3: 'full_house',
-                4: 'flush',
-                5: 'straight',
-                6: 'three_of_a_kind',
-                7: 'two_pair'
-            }
-            outcome_key = hand_class_to_outcome.get(hand_class)
-    else:
-        # High card - always a loss
-        outcome_key = 'high_card'
-        hand_class_counter[outcome_key] += 1
-        if return_cards:
-            return -bet_amount, 'loss (high card)', hand
-        return -bet_amount, 'loss (high card)'
-    
-    if outcome_key:
-        hand_class_counter[outcome_key] += 1
-    
-    if payout_factor > 0:
-        payout = payout_factor * bet_amount
-        if return_cards:
-            return payout, hand_desc, hand
-        return payout, hand_desc
+    if tables is not None:
+        outcome_key = tables.outcome(hand)
     else:
-        if return_cards:
-            return -bet_amount, hand_desc, hand
-        return -bet_amount, hand_desc
+        outcome_key = hand.outcome()
+    hand_class_counter[outcome_key] += 1
+    return OUTCOME_PAYOUTS[outcome_key] * bet_amount, OUTCOME_DESCRIPTIONS[outcome_key]
 
 if __name__ == "__main__":
     # Run the simulation using configuration defaults
@@ -0,0 +1,181 @@
+"""
+Decision-regret analysis of recorded Mississippi Stud hand histories.
+
+Hand histories are CSV files with one hand per row and an optional header:
+
+    player_id,cards,actions
+    p17,As Kd 7h 7c 2s,bet1 bet3 bet3
+    p04,9c 4d 2h,bet1 fold
+
+``cards`` lists the player's cards in the order they were dealt and ``actions``
+holds the decision made at each street ('fold', 'bet1' or 'bet3'), ending at
+the fold if the player folded; a hand that repeats a card or acts after a fold
+is rejected. Every decision is compared with the EV-optimal action under the
+config.py paytable; the EV given up is the decision's regret.
+"""
+
+import csv
+import sys
+from itertools import islice
+
+from deuces import Card
+from config import DEFAULT_BET, REGRET_CONFIG
+from utils.exact_ev import ACTIONS, BET_SIZES, ExactEVCalculator, canonical_state
+
+
+def read_hand_histories(path, chunk_size=None):
+    """
+    Stream hand histories from a CSV file in chunks, so files larger than memory can be processed.
+    Args:
+        path (str): Path to the hand-history CSV file.
+        chunk_size (int): Number of rows per chunk. Defaults to REGRET_CONFIG['chunk_size'].
+    Yields:
+        list: Chunks of (line_number, player_id, cards, actions) tuples.
+    """
+    chunk_size = chunk_size or REGRET_CONFIG['chunk_size']
+    with open(path, newline='') as f:
+        rows = enumerate(csv.reader(f), start=1)
+        while True:
+            batch = list(islice(rows, chunk_size))
+            if not batch:
+                return
+            chunk = []
+            for line_number, row in batch:
+                if not row or (line_number == 1 and row[0] == 'player_id'):
+                    continue
+                if len(row) != 3:
+                    raise ValueError(f"Line {line_number}: expected 3 columns, got {len(row)}")
+                player_id, cards, actions = row
+                try:
+                    parsed_cards = [Card.new(token) for token in cards.split()]
+                except (KeyError, IndexError):
+                    raise ValueError(f"Line {line_number}: invalid cards {cards!r}") from None
+                chunk.append((line_number, player_id, parsed_cards, actions.split()))
+            if chunk:
+                yield chunk
+
+
+def describe_situation(street, key, committed):
+    """
+    Human-readable label for a canonical situation, e.g. 'step2 AK|7 (wagered 2)'.
+    Ranks held in the same suit are grouped together; groups are separated by '|'.
+    """
+    groups = [''.join(Card.STR_RANKS[r] for r in reversed(known)) for known, _ in key if known]
+    return f"step{street} {'|'.join(groups)} (wagered {committed})"
+
+
+class RegretAggregator:
+    """
+    Accumulates decision regret per player and per situation.
+    A situation is a street together with the canonical, suit-isomorphic hand
+    and the amount already wagered, since the best action depends on all three.
+    """
+
+    def __init__(self, calculator=None):
+        """
+        Initialize the aggregator.
+        Args:
+            calculator (ExactEVCalculator): Optional shared calculator (and its caches).
+        """
+        self.calculator = calculator or ExactEVCalculator()
+        self.hands = 0
+        self.per_player = {}
+        self.per_situation = {}
+
+    def add_hand(self, player_id, cards, actions, line_number=None):
+        """
+        Score every decision of one recorded hand.
+        Args:
+            player_id (str): The player's identifier.
+            cards (list): The player's deuces cards in dealing order.
+            actions (list): The player's action at each street.
+            line_number (int): Source line, used in error messages.
+        Returns:
+            float: Total regret of the hand.
+        """
+        where = f"Line {line_number}: " if line_number is not None else ''
+        if not 1 <= len(actions) <= 3:
+            raise ValueError(f"{where}expected 1 to 3 actions, got {len(actions)}")
+        if len(cards) < len(actions) + 1:
+            raise ValueError(f"{where}{len(actions)} actions need at least {len(actions) + 1} cards")
+        seen = set()
+        for card in cards:
+            if card in seen:
+                raise ValueError(f"{where}duplicate card {Card.int_to_str(card)}")
+            seen.add(card)
+        if 'fold' in actions[:-1]:
+            raise ValueError(f"{where}actions after a fold")
+        committed = DEFAULT_BET
+        hand_regret = 0.0
+        for street, action in enumerate(actions, start=1):
+            if action not in ACTIONS:
+                raise ValueError(f"{where}unknown action {action!r}")
+            key = canonical_state(cards[:street + 1])
+            evs = self.calculator.state_action_evs(key, committed)
+            best = max(evs.values())
+            regret = best - evs[action]
+            hand_regret += regret
+            self._record(self.per_player, player_id, regret)
+            self._record(self.per_situation, (street, key, committed), regret)
+            if action == 'fold':
+                break
+            committed += BET_SIZES[action]
+        self.hands += 1
+        return hand_regret
+
+    @staticmethod
+    def _record(table, key, regret):
+        stats = table.get(key)
+        if stats is None:
+            stats = table[key] = {'decisions': 0, 'mistakes': 0, 'regret': 0.0}
+        stats['decisions'] += 1
+        stats['regret'] += regret
+        if regret > 1e-9:
+            stats['mistakes'] += 1
+
+
+def analyze_hand_histories(path, chunk_size=None, aggregator=None):
+    """
+    Stream a hand-history file through the regret aggregator.
+    Args:
+        path (str): Path to the hand-history CSV file.
+        chunk_size (int): Number of rows read per chunk.
+        aggregator (RegretAggregator): Optional aggregator to add to (e.g. across several files).
+    Returns:
+        RegretAggregator: The aggregated regret statistics.
+    """
+    aggregator = aggregator or RegretAggregator()
+    for chunk in read_hand_histories(path, chunk_size):
+        for line_number, player_id, cards, actions in chunk:
+            aggregator.add_hand(player_id, cards, actions, line_number)
+    return aggregator
+
+
+def print_report(aggregator, top_situations=None):
+    """
+    Print per-player regret and the costliest situations.
+    Args:
+        aggregator (RegretAggregator): The aggregated statistics.
+        top_situations (int): Number of situations to list. Defaults to REGRET_CONFIG['top_situations'].
+    """
+    top_situations = top_situations or REGRET_CONFIG['top_situations']
+    print(f"Analyzed {aggregator.hands} hands.")
+    print("Regret per player:")
+    for player_id, stats in sorted(aggregator.per_player.items(), key=lambda item: -item[1]['regret']):
+        print(f"  {player_id}: {stats['regret']:.4f} over {stats['decisions']} decisions "
+              f"({stats['mistakes']} mistakes, {stats['regret'] / stats['decisions']:.4f} per decision)")
+    print(f"Costliest situations (top {top_situations}):")
+    ranked = sorted(aggregator.per_situation.items(), key=lambda item: -item[1]['regret'])
+    for (street, key, committed), stats in ranked[:top_situations]:
+        print(f"  {describe_situation(street, key, committed)}: {stats['regret']:.4f} "
+              f"over {stats['decisions']} decisions ({stats['mistakes']} mistakes)")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(f"Usage: {sys.argv[0]} HAND_HISTORY.csv [...]")
+        sys.exit(1)
+    report = RegretAggregator()
+    for history_path in sys.argv[1:]:
+        analyze_hand_histories(history_path, aggregator=report)
+    print_report(report)
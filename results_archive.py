@@ -0,0 +1,320 @@
+"""
+On-disk archive of simulation results.
+
+Runs are stored in SQLite, keyed by strategy, strategy-code hash, strategy-config
+hash, paytable hash, engine version, seed and unit size. Each run holds mergeable statistics
+(hand count, payout sum and sum of squares, outcome counts and a payout
+histogram), with the counters and histogram kept as a compressed blob. A run
+is simulated in seeded units (see distributed_sim.simulate_unit), so asking
+for more hands of a stored configuration only simulates the missing units and
+merges them in, and the result equals a single run of the same length.
+
+Usage:
+    python results_archive.py run HANDS [--strategy point] [--seed 0]
+    python results_archive.py list [--strategy point] [--min-hands N]
+"""
+
+import argparse
+import hashlib
+import inspect
+import json
+import math
+import sqlite3
+import sys
+import time
+import zlib
+
+from config import (DEFAULT_BET, PAYOUT_TABLE, RESULTS_ARCHIVE_CONFIG, ROYAL_FLUSH_PAYOUT,
+                    STRATEGY_CONFIG)
+from distributed_sim import empty_result, merge_results, print_results, simulate_unit
+from mississippi_stud_sim import ENGINE_VERSION, get_strategy
+from utils.payouts import OUTCOME_PAYOUTS
+
+KEY_COLUMNS = ('strategy', 'strategy_hash', 'config_hash', 'paytable_hash', 'engine_version', 'seed', 'unit_hands')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    strategy TEXT NOT NULL,
+    strategy_hash TEXT NOT NULL,
+    config_hash TEXT NOT NULL,
+    paytable_hash TEXT NOT NULL,
+    engine_version INTEGER NOT NULL,
+    seed INTEGER NOT NULL,
+    unit_hands INTEGER NOT NULL,
+    units INTEGER NOT NULL,
+    hands INTEGER NOT NULL,
+    total_payout INTEGER NOT NULL,
+    total_payout_sq INTEGER NOT NULL,
+    created REAL NOT NULL,
+    updated REAL NOT NULL,
+    UNIQUE (strategy, strategy_hash, config_hash, paytable_hash, engine_version, seed, unit_hands)
+);
+CREATE INDEX IF NOT EXISTS runs_by_strategy ON runs (strategy, strategy_hash, engine_version, hands);
+CREATE INDEX IF NOT EXISTS runs_by_config ON runs (config_hash, paytable_hash);
+CREATE INDEX IF NOT EXISTS runs_by_updated ON runs (updated);
+CREATE TABLE IF NOT EXISTS run_blobs (
+    run_id INTEGER PRIMARY KEY REFERENCES runs (id) ON DELETE CASCADE,
+    data BLOB NOT NULL
+);
+"""
+
+# Bumped whenever KEY_COLUMNS or the tables change; older archives are rebuilt
+SCHEMA_VERSION = 2
+
+# Top-level packages whose source counts towards a strategy's code hash
+STRATEGY_PACKAGES = ('strategies', 'utils')
+
+
+def _digest(value):
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def config_hash(config=None):
+    """
+    Hash of the settings a strategy plays under.
+    Args:
+        config (dict): Strategy configuration, or None for STRATEGY_CONFIG.
+    Returns:
+        str: A short hex digest.
+    """
+    return _digest({'strategy_config': config or STRATEGY_CONFIG, 'default_bet': DEFAULT_BET})
+
+
+def _strategy_modules(module, seen):
+    """Add module and every STRATEGY_PACKAGES module it uses, directly or not, to seen."""
+    seen.add(module.__name__)
+    for value in vars(module).values():
+        name = value.__name__ if inspect.ismodule(value) else getattr(value, '__module__', None)
+        if (isinstance(name, str) and name.split('.')[0] in STRATEGY_PACKAGES
+                and name not in seen and name in sys.modules):
+            _strategy_modules(sys.modules[name], seen)
+
+
+def strategy_hash(strategy_name):
+    """
+    Hash of the code a strategy decides with: the source of the modules defining
+    the strategy class and its bases, and of every strategies or utils module they
+    use (such as utils/hand_state.py and utils/exact_ev.py). Editing any of them
+    changes the hash, so archived runs of the old code are not reused.
+    Args:
+        strategy_name (str): Name of the strategy.
+    Returns:
+        str: A short hex digest.
+    """
+    seen = set()
+    for cls in type(get_strategy(strategy_name)).__mro__:
+        if cls.__module__.split('.')[0] in STRATEGY_PACKAGES:
+            _strategy_modules(sys.modules[cls.__module__], seen)
+    return _digest({name: inspect.getsource(sys.modules[name]) for name in sorted(seen)})
+
+
+def paytable_hash():
+    """Hash of the main-game paytable."""
+    return _digest({'payout_table': PAYOUT_TABLE, 'royal_flush': ROYAL_FLUSH_PAYOUT,
+                    'outcome_payouts': OUTCOME_PAYOUTS})
+
+
+def _encode_blob(result):
+    # JSON object keys are strings, so the histogram is stored as [payout, count] pairs
+    data = {'outcomes': result['outcomes'], 'payout_histogram': sorted(result['payout_histogram'].items())}
+    return zlib.compress(json.dumps(data).encode())
+
+
+def _decode_blob(blob):
+    data = json.loads(zlib.decompress(blob))
+    return data['outcomes'], {payout: count for payout, count in data['payout_histogram']}
+
+
+def summarize(result):
+    """
+    EV per hand and its standard error from a result's sums.
+    Args:
+        result (dict): A merged result.
+    Returns:
+        tuple: (ev, std_error); the standard error is None below two hands.
+    """
+    hands = result['hands']
+    if hands == 0:
+        return None, None
+    ev = result['total_payout'] / hands
+    if hands < 2:
+        return ev, None
+    variance = (result['total_payout_sq'] - hands * ev * ev) / (hands - 1)
+    return ev, math.sqrt(max(variance, 0.0) / hands)
+
+
+def format_ev(result):
+    """EV per hand with its standard error, e.g. '-0.14800 +/- 0.02345', or 'n/a' parts."""
+    ev, std_error = summarize(result)
+    ev_text = 'n/a' if ev is None else f"{ev:.5f}"
+    return ev_text if std_error is None else f"{ev_text} +/- {std_error:.5f}"
+
+
+class ResultsArchive:
+    """
+    SQLite store of mergeable simulation results.
+    """
+
+    def __init__(self, path=None):
+        """
+        Open, creating if needed, the archive database.
+        Args:
+            path (str): Database file, or None for RESULTS_ARCHIVE_CONFIG['path'].
+        """
+        self.path = path or RESULTS_ARCHIVE_CONFIG['path']
+        self._db = sqlite3.connect(self.path)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA foreign_keys = ON")
+        if self._db.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            # Runs stored before the strategy-code hash cannot be matched to the
+            # code that produced them, so they are dropped rather than reused
+            self._db.executescript("DROP TABLE IF EXISTS run_blobs; DROP TABLE IF EXISTS runs;")
+            self._db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._db.executescript(SCHEMA)
+
+    def run_key(self, strategy_name, seed=None, unit_hands=None):
+        """
+        The archive key of a run under the current strategy code, paytable and engine version.
+        Returns:
+            dict: Mapping of KEY_COLUMNS to values.
+        """
+        return {
+            'strategy': strategy_name,
+            'strategy_hash': strategy_hash(strategy_name),
+            'config_hash': config_hash(),
+            'paytable_hash': paytable_hash(),
+            'engine_version': ENGINE_VERSION,
+            'seed': RESULTS_ARCHIVE_CONFIG['seed'] if seed is None else seed,
+            'unit_hands': unit_hands or RESULTS_ARCHIVE_CONFIG['unit_hands'],
+        }
+
+    def simulate(self, number_of_hands, strategy_name='point', seed=None, unit_hands=None, verbose=True):
+        """
+        Result of at least number_of_hands hands, simulating only what is not stored yet.
+        Hands are simulated in whole units, so the count is rounded up to a multiple
+        of unit_hands, and a stored run longer than requested is returned whole.
+        Args:
+            number_of_hands (int): The number of hands wanted.
+            strategy_name (str): Name of the strategy to use.
+            seed (int): The run seed, or None for RESULTS_ARCHIVE_CONFIG['seed'].
+            unit_hands (int): Hands per unit, or None for RESULTS_ARCHIVE_CONFIG['unit_hands'].
+            verbose (bool): If True, report how many hands came from the archive.
+        Returns:
+            dict: The merged result, with 'hands', 'total_payout', 'total_payout_sq',
+                'outcomes' and 'payout_histogram'.
+        """
+        key = self.run_key(strategy_name, seed, unit_hands)
+        row = self._find_run(key)
+        result = self.load(row['id']) if row else empty_result()
+        stored_units = row['units'] if row else 0
+        units = math.ceil(number_of_hands / key['unit_hands'])
+        if verbose:
+            print(f"Archive: {result['hands']} hands stored, simulating {max(units - stored_units, 0) * key['unit_hands']} more.")
+        if units <= stored_units:
+            return result
+        for unit_index in range(stored_units, units):
+            unit = simulate_unit(strategy_name, key['seed'], unit_index, key['unit_hands'])
+            result = merge_results(result, unit)
+        self._store(key, units, result)
+        return result
+
+    def _find_run(self, key):
+        where = ' AND '.join(f"{column} = ?" for column in KEY_COLUMNS)
+        return self._db.execute(f"SELECT * FROM runs WHERE {where}",
+                                [key[column] for column in KEY_COLUMNS]).fetchone()
+
+    def _store(self, key, units, result):
+        """
+        Insert or grow a run in one statement, so concurrent writers of the same
+        key never collide; a run is only replaced by one with more units.
+        """
+        now = time.time()
+        columns = KEY_COLUMNS + ('units', 'hands', 'total_payout', 'total_payout_sq', 'created', 'updated')
+        values = [key[column] for column in KEY_COLUMNS] + [
+            units, result['hands'], result['total_payout'], result['total_payout_sq'], now, now]
+        with self._db:
+            row = self._db.execute(
+                f"INSERT INTO runs ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+                f"ON CONFLICT ({', '.join(KEY_COLUMNS)}) DO UPDATE SET "
+                "units = excluded.units, hands = excluded.hands, total_payout = excluded.total_payout, "
+                "total_payout_sq = excluded.total_payout_sq, updated = excluded.updated "
+                "WHERE excluded.units > runs.units RETURNING id", values).fetchone()
+            if row is not None:
+                self._db.execute("INSERT OR REPLACE INTO run_blobs (run_id, data) VALUES (?, ?)",
+                                 (row['id'], _encode_blob(result)))
+
+    def load(self, run_id):
+        """
+        The full result of a stored run.
+        Args:
+            run_id (int): The run's id.
+        Returns:
+            dict: The merged result.
+        """
+        row = self._db.execute(
+            "SELECT r.hands, r.total_payout, r.total_payout_sq, b.data "
+            "FROM runs r JOIN run_blobs b ON b.run_id = r.id WHERE r.id = ?", (run_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"No stored run with id {run_id}")
+        outcomes, histogram = _decode_blob(row['data'])
+        return {
+            'hands': row['hands'],
+            'total_payout': row['total_payout'],
+            'total_payout_sq': row['total_payout_sq'],
+            'outcomes': outcomes,
+            'payout_histogram': histogram,
+        }
+
+    def find(self, strategy=None, engine_version=None, config_hash=None, paytable_hash=None,
+             seed=None, min_hands=None, strategy_hash=None):
+        """
+        Stored runs matching every given filter, largest first.
+        Filters are answered from the indexed columns without reading the blobs.
+        Returns:
+            list: One dict per run with its key columns, id, units, hands, sums and timestamps.
+        """
+        filters = {'strategy': strategy, 'strategy_hash': strategy_hash, 'engine_version': engine_version, 'config_hash': config_hash,
+                   'paytable_hash': paytable_hash, 'seed': seed}
+        clauses = [f"{column} = ?" for column, value in filters.items() if value is not None]
+        params = [value for value in filters.values() if value is not None]
+        if min_hands is not None:
+            clauses.append("hands >= ?")
+            params.append(min_hands)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        rows = self._db.execute(f"SELECT * FROM runs {where} ORDER BY hands DESC, id", params)
+        return [dict(row) for row in rows]
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archived Mississippi Stud simulation results")
+    parser.add_argument('--archive', default=RESULTS_ARCHIVE_CONFIG['path'])
+    subparsers = parser.add_subparsers(dest='mode', required=True)
+    run_parser = subparsers.add_parser('run')
+    run_parser.add_argument('hands', type=int)
+    run_parser.add_argument('--strategy', default='point')
+    run_parser.add_argument('--seed', type=int, default=RESULTS_ARCHIVE_CONFIG['seed'])
+    list_parser = subparsers.add_parser('list')
+    list_parser.add_argument('--strategy')
+    list_parser.add_argument('--min-hands', type=int)
+    args = parser.parse_args()
+
+    with ResultsArchive(args.archive) as archive:
+        if args.mode == 'run':
+            result = archive.simulate(args.hands, args.strategy, args.seed)
+            print_results(result)
+            print(f"EV per hand: {format_ev(result)}")
+        else:
+            for run in archive.find(strategy=args.strategy, min_hands=args.min_hands):
+                print(f"{run['id']:5}  {run['strategy']:12} code {run['strategy_hash']}  seed {run['seed']:<6} engine v{run['engine_version']}  "
+                      f"config {run['config_hash']}  paytable {run['paytable_hash']}  "
+                      f"{run['hands']:>10} hands  EV {format_ev(run)}")
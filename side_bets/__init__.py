@@ -0,0 +1,9 @@
+"""
+Side bet package for Mississippi Stud simulation.
+Contains side wagers that are settled from the same cards as the main game.
+"""
+
+from .base_side_bet import BaseSideBet
+from .three_card_bonus import ThreeCardBonus
+
+__all__ = ['BaseSideBet', 'ThreeCardBonus']
@@ -0,0 +1,69 @@
+"""
+Base side bet class for Mississippi Stud simulation.
+"""
+
+from abc import ABC, abstractmethod
+from config import DEFAULT_BET, SIDE_BET_PAYOUTS
+
+
+class BaseSideBet(ABC):
+    """
+    Abstract base class for side bets.
+    A side bet is settled from the first cards_needed cards of the deal and keeps
+    its own outcome counters and running payout, like hand_class_counter does for
+    the main wager.
+    """
+
+    # Key into SIDE_BET_PAYOUTS and display name
+    name = None
+    # Number of cards (from the start of the deal) the side bet is settled on
+    cards_needed = None
+
+    def __init__(self, paytable=None, wager=DEFAULT_BET):
+        """
+        Initialize the side bet.
+        Args:
+            paytable (dict): Optional mapping of outcome to net multiplier. If None, uses SIDE_BET_PAYOUTS.
+            wager (int): Amount staked on the side bet each hand.
+        """
+        self.paytable = paytable or SIDE_BET_PAYOUTS[self.name]
+        self.wager = wager
+        self.reset()
+
+    def reset(self):
+        """Clear the outcome counters and running totals."""
+        self.outcome_counter = {outcome: 0 for outcome in self.paytable}
+        self.outcome_counter['loss'] = 0
+        self.hands = 0
+        self.total_payout = 0
+
+    @abstractmethod
+    def classify(self, cards):
+        """
+        Classify the side bet's cards.
+        Args:
+            cards (list): The first cards_needed cards of the deal.
+        Returns:
+            str: A paytable outcome, or 'loss'.
+        """
+        pass
+
+    def settle(self, cards):
+        """
+        Settle one hand of the side bet and record it.
+        Args:
+            cards (list): The first cards_needed cards of the deal.
+        Returns:
+            int: The net payout of the side wager.
+        """
+        outcome = self.classify(cards)
+        payout = self.paytable.get(outcome, -1) * self.wager
+        self.outcome_counter[outcome] = self.outcome_counter.get(outcome, 0) + 1
+        self.hands += 1
+        self.total_payout += payout
+        return payout
+
+    @property
+    def ev(self):
+        """Average net payout per unit wagered so far."""
+        return self.total_payout / (self.hands * self.wager) if self.hands else 0.0
@@ -0,0 +1,58 @@
+"""
+3 Card Bonus side bet for Mississippi Stud.
+"""
+
+from itertools import combinations_with_replacement
+
+from .base_side_bet import BaseSideBet
+from utils.cards import make_card
+
+
+def _classify_ranks(ranks, is_flush):
+    """Classify three sorted ranks as a three-card poker hand."""
+    is_straight = (len(set(ranks)) == 3 and ranks[2] - ranks[0] == 2) or ranks == [0, 1, 12]
+
+    if is_straight and is_flush:
+        return 'mini_royal' if ranks == [10, 11, 12] else 'straight_flush'
+    if ranks[0] == ranks[2]:
+        return 'three_of_a_kind'
+    if is_straight:
+        return 'straight'
+    if is_flush:
+        return 'flush'
+    if ranks[0] == ranks[1] or ranks[1] == ranks[2]:
+        return 'pair'
+    return 'loss'
+
+
+def _build_outcomes():
+    # deuces cards hold their rank's prime in the low byte, so the product of the
+    # three primes identifies the ranks regardless of order
+    outcomes = {}
+    for ranks in combinations_with_replacement(range(13), 3):
+        product = 1
+        for rank in ranks:
+            product *= make_card(rank, 0) & 0xFF
+        outcomes[product, False] = _classify_ranks(list(ranks), False)
+        if len(set(ranks)) == 3:
+            outcomes[product, True] = _classify_ranks(list(ranks), True)
+    return outcomes
+
+
+class ThreeCardBonus(BaseSideBet):
+    """
+    Pays on the three-card poker value of the player's first three cards.
+    """
+
+    name = 'three_card_bonus'
+    cards_needed = 3
+
+    # Outcome of every (rank prime product, is_flush) pair, so classifying is one lookup
+    _OUTCOMES = _build_outcomes()
+
+    def classify(self, cards):
+        """Classify the first three cards as a three-card poker hand."""
+        first, second, third = cards
+        # The suit bits (12-15) of all three cards only overlap in a flush
+        is_flush = first & second & third & 0xF000 != 0
+        return self._OUTCOMES[(first & 0xFF) * (second & 0xFF) * (third & 0xFF), is_flush]
@@ -7,5 +7,7 @@ from .base_strategy import BaseStrategy
 from .point_strategy import PointStrategy
 from .conservative_strategy import ConservativeStrategy
 from .optimal_strategy import OptimalStrategy
+from .exact_strategy import ExactStrategy
+from .table_strategy import TableStrategy
 
-__all__ = ['BaseStrategy', 'PointStrategy', 'ConservativeStrategy', 'OptimalStrategy']
+__all__ = ['BaseStrategy', 'PointStrategy', 'ConservativeStrategy', 'OptimalStrategy', 'ExactStrategy', 'TableStrategy']
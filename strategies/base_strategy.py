@@ -10,7 +10,13 @@ class BaseStrategy(ABC):
     """
     Abstract base class for Mississippi Stud strategies.
     All strategies must implement the three evaluation methods for each betting round.
+    simulate_hand() passes the hand as a utils.hand_state.HandState, a list of
+    cards whose rank, suit and point counts are kept up to date as cards are dealt.
     """
+
+    # Whether the strategy's decisions are worth precomputing into shared tables
+    # for worker processes: true only when a fresh instance has a real warm-up cost
+    precompute_decisions = False
     
     def __init__(self, config=None):
         """
@@ -1,5 +1,6 @@
 from .base_strategy import BaseStrategy
 from config import STRATEGY_CONFIG
+from utils.hand_state import HandState
 
 class ConservativeStrategy(BaseStrategy):
     """
@@ -14,44 +15,39 @@ class ConservativeStrategy(BaseStrategy):
     
     def eval_step_1(self, hand):
         """Conservative evaluation for step 1 - only bet on strong hands."""
-        card1, card2 = hand
-        rank1 = card1 % 13
-        rank2 = card2 % 13
+        state = HandState.of(hand)
         
         # Only bet big on high pairs (10s or better)
-        if rank1 == rank2:
-            if rank1 >= 8:  # 10s or better
+        if state.has_pair:
+            if state.pair_rank >= 8:  # 10s or better
                 return 'bet3'
-            elif rank1 >= self.config['min_push_pair_rank']:
+            elif state.pair_rank >= self.config['min_push_pair_rank']:
                 return 'bet1'  # 6-9 pairs
             else:
                 return 'fold'  # Lower pairs
         # Very conservative - only bet on two high cards
-        elif rank1 >= 9 and rank2 >= 9:  # Both Jacks or higher
+        elif state.high_cards == 2:  # Both Jacks or higher
             return 'bet1'
         else:
             return 'fold'
     
     def eval_step_2(self, hand):
         """Conservative evaluation for step 2."""
-        card1, card2, card3 = hand
-        ranks = [card1 % 13, card2 % 13, card3 % 13]
+        state = HandState.of(hand)
         
         # Check for trips
-        if ranks[0] == ranks[1] == ranks[2]:
+        if state.has_trips:
             return 'bet3'
         # Check for high pairs only
-        for i in range(3):
-            for j in range(i+1, 3):
-                if ranks[i] == ranks[j]:
-                    if ranks[i] >= 8:  # 10s or better
-                        return 'bet3'
-                    elif ranks[i] >= self.config['min_push_pair_rank']:
-                        return 'bet1'  # 6-9 pairs
-                    else:
-                        return 'fold'  # Lower pairs
+        if state.has_pair:
+            if state.pair_rank >= 8:  # 10s or better
+                return 'bet3'
+            elif state.pair_rank >= self.config['min_push_pair_rank']:
+                return 'bet1'  # 6-9 pairs
+            else:
+                return 'fold'  # Lower pairs
         # Very conservative - only continue with 3 high cards
-        high_cards = sum(1 for rank in ranks if rank >= 9)
+        high_cards = state.high_cards
         if high_cards >= 3:
             return 'bet1'
         else:
@@ -59,30 +55,21 @@ class ConservativeStrategy(BaseStrategy):
     
     def eval_step_3(self, hand):
         """Conservative evaluation for step 3."""
-        card1, card2, card3, card4 = hand
-        ranks = [card1 % 13, card2 % 13, card3 % 13, card4 % 13]
+        state = HandState.of(hand)
         
-        # Check for quads
-        if len(set(ranks)) == 1:
+        # Check for quads or trips
+        if state.has_trips:
             return 'bet3'
-        # Check for trips
-        for i in range(4):
-            for j in range(i+1, 4):
-                for k in range(j+1, 4):
-                    if ranks[i] == ranks[j] == ranks[k]:
-                        return 'bet3'
-        # Check for high pairs only
-        for i in range(4):
-            for j in range(i+1, 4):
-                if ranks[i] == ranks[j]:
-                    if ranks[i] >= 8:  # 10s or better
-                        return 'bet3'
-                    elif ranks[i] >= self.config['min_push_pair_rank']:
-                        return 'bet1'  # 6-9 pairs
-                    else:
-                        return 'fold'  # Lower pairs
+        # Check for high pairs only; with two pair the higher pair decides
+        if state.has_pair:
+            if state.pair_rank >= 8:  # 10s or better
+                return 'bet3'
+            elif state.pair_rank >= self.config['min_push_pair_rank']:
+                return 'bet1'  # 6-9 pairs
+            else:
+                return 'fold'  # Lower pairs
         # Very conservative - only continue with mostly high cards
-        high_cards = sum(1 for rank in ranks if rank >= 9)
+        high_cards = state.high_cards
         if high_cards >= 3:
             return 'bet1'
         else:
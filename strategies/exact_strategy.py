@@ -0,0 +1,48 @@
+"""
+Exact Strategy for Mississippi Stud betting decisions.
+"""
+
+from .base_strategy import BaseStrategy
+from config import DEFAULT_BET
+from utils.exact_ev import BET_SIZES, ExactEVCalculator
+
+
+class ExactStrategy(BaseStrategy):
+    """
+    The Exact Strategy takes the EV-maximizing action at every step, using exact
+    EVs from enumerating the remaining deck. It tracks the amount wagered on the
+    current hand from its own decisions, since the best action depends on it.
+    """
+
+    # A fresh process spends seconds filling the EV caches before its first
+    # decisions, so worker pools share a decision table instead
+    precompute_decisions = True
+
+    # Shared by all instances so the memoized EVs survive across simulations
+    _calculator = None
+
+    def __init__(self, config=None):
+        """Initialize the Exact Strategy."""
+        super().__init__(config)
+        if ExactStrategy._calculator is None:
+            ExactStrategy._calculator = ExactEVCalculator()
+        self.committed = DEFAULT_BET
+
+    def _decide(self, hand):
+        action = self._calculator.best_action(hand, self.committed)
+        if action != 'fold':
+            self.committed += BET_SIZES[action]
+        return action
+
+    def eval_step_1(self, hand):
+        """Exact evaluation for step 1; starts a new hand."""
+        self.committed = DEFAULT_BET
+        return self._decide(hand)
+
+    def eval_step_2(self, hand):
+        """Exact evaluation for step 2."""
+        return self._decide(hand)
+
+    def eval_step_3(self, hand):
+        """Exact evaluation for step 3."""
+        return self._decide(hand)
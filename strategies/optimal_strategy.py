@@ -1,5 +1,7 @@
 from .base_strategy import BaseStrategy
 from utils.hand_analyzer import HandAnalyzer
+from utils.cards import card_rank
+from utils.hand_state import HandState
 
 class OptimalStrategy(BaseStrategy):
     """
@@ -14,8 +16,8 @@ class OptimalStrategy(BaseStrategy):
     def eval_step_1(self, hand):
         """Optimal evaluation for step 1 based on mathematical analysis."""
         card1, card2 = hand
-        rank1 = card1 % 13
-        rank2 = card2 % 13
+        rank1 = card_rank(card1)
+        rank2 = card_rank(card2)
         
         # Always bet 3x with pairs of 6s or better
         if rank1 == rank2 and rank1 >= 5:  # 6s or better
@@ -34,15 +36,14 @@ class OptimalStrategy(BaseStrategy):
     
     def eval_step_2(self, hand):
         """Optimal evaluation for step 2."""
-        card1, card2, card3 = hand
-        ranks = sorted([card1 % 13, card2 % 13, card3 % 13])
+        state = HandState.of(hand)
         
         # Always bet 3x with trips
-        if ranks[0] == ranks[1] == ranks[2]:
+        if state.has_trips:
             return 'bet3'
         
         # Always bet 3x with pairs of 6s or better
-        pair_rank = self.analyzer.get_pair_rank([card1, card2, card3])
+        pair_rank = state.pair_rank
         if pair_rank is not None and pair_rank >= 5:  # 6s or better
             return 'bet3'
         
@@ -51,16 +52,16 @@ class OptimalStrategy(BaseStrategy):
             return 'bet1'
         
         # High card hands - bet 1x with Q-6-4 or better
+        ranks = sorted(card_rank(card) for card in hand)
         if ranks >= [3, 5, 11]:  # Q-6-4 or better
             return 'bet1'
         
         # Check for flush draws and straight draws
-        suits = [card1 // 13, card2 // 13, card3 // 13]
-        if len(set(suits)) == 1:  # All same suit (flush draw)
+        if state.flush_draw(3):  # All same suit (flush draw)
             return 'bet1'
         
         # Check for open-ended straight draws
-        if self.analyzer.has_straight_draw([card1, card2, card3]):
+        if self.analyzer.has_straight_draw(hand):
             return 'bet1'
         
         # Otherwise fold
@@ -68,20 +69,14 @@ class OptimalStrategy(BaseStrategy):
     
     def eval_step_3(self, hand):
         """Optimal evaluation for step 3."""
-        card1, card2, card3, card4 = hand
-        ranks = sorted([card1 % 13, card2 % 13, card3 % 13, card4 % 13])
+        state = HandState.of(hand)
         
-        # Always bet 3x with quads
-        if ranks[0] == ranks[1] == ranks[2] == ranks[3]:
-            return 'bet3'
-        
-        # Always bet 3x with trips
-        trip_rank = self.analyzer.get_trips_rank([card1, card2, card3, card4])
-        if trip_rank is not None:
+        # Always bet 3x with quads or trips
+        if state.has_trips:
             return 'bet3'
         
         # Always bet 3x with pairs of 6s or better
-        pair_rank = self.analyzer.get_pair_rank([card1, card2, card3, card4])
+        pair_rank = state.pair_rank
         if pair_rank is not None and pair_rank >= 5:  # 6s or better
             return 'bet3'
         
@@ -90,19 +85,16 @@ class OptimalStrategy(BaseStrategy):
             return 'bet1'
         
         # High card hands - bet 1x with Q-6-4-2 or better
+        ranks = sorted(card_rank(card) for card in hand)
         if ranks >= [1, 3, 5, 11]:  # Q-6-4-2 or better
             return 'bet1'
         
         # Check for flush draws (4 cards same suit)
-        suits = [card1 // 13, card2 // 13, card3 // 13, card4 // 13]
-        suit_counts = {}
-        for suit in suits:
-            suit_counts[suit] = suit_counts.get(suit, 0) + 1
-        if max(suit_counts.values()) >= 4:  # 4-card flush draw
+        if state.flush_draw(4):  # 4-card flush draw
             return 'bet1'
         
         # Check for straight draws
-        if self.analyzer.has_straight_draw([card1, card2, card3, card4]):
+        if self.analyzer.has_straight_draw(hand):
             return 'bet1'
         
         # Otherwise fold
@@ -3,7 +3,8 @@ Point Strategy for Mississippi Stud betting decisions.
 """
 
 from strategies.base_strategy import BaseStrategy
-from utils.hand_analyzer import HandAnalyzer
+from utils.hand_state import HandState
+from utils.cards import card_rank
 
 
 def card_points(card, config):
@@ -15,7 +16,7 @@ def card_points(card, config):
     Returns:
         int: The point value of the card.
     """
-    rank = card % 13
+    rank = card_rank(card)
     # deuces: 0=2, 1=3, 2=4, 3=5, 4=6, 5=7, 6=8, 7=9, 8=10, 9=J, 10=Q, 11=K, 12=A
     if 4 <= rank <= 8:  # 6-10
         return config['card_points']['push_cards']
@@ -40,16 +41,14 @@ class PointStrategy(BaseStrategy):
         Returns:
             str: 'fold', 'bet1', or 'bet3' based on the hand.
         """
-        card1, card2 = hand
-        rank1 = card1 % 13
-        rank2 = card2 % 13
+        state = HandState.of(hand)
         
-        if rank1 == rank2:
-            if rank1 >= self.config['min_push_pair_rank']:
+        if state.has_pair:
+            if state.pair_rank >= self.config['min_push_pair_rank']:
                 return 'bet3'  # Pair of sixes or higher
             else:
                 return 'bet1'  # Lower pairs
-        elif card_points(card1, self.config) + card_points(card2, self.config) >= self.config['step1_bet_threshold']:
+        elif state.points(self.config) >= self.config['step1_bet_threshold']:
             return 'bet1'
         else:
             return 'fold'
@@ -62,26 +61,22 @@ class PointStrategy(BaseStrategy):
         Returns:
             str: 'fold', 'bet1', or 'bet3' based on the hand.
         """
-        ranks = [card % 13 for card in hand]
+        state = HandState.of(hand)
         
         # Check for trips first
-        has_trips, _ = HandAnalyzer.has_trips(ranks)
-        if has_trips:
+        if state.has_trips:
             return 'bet3'
         
         # Check for a pair of sixes or better
-        has_high_pair, pair_rank = HandAnalyzer.has_pair(ranks, self.config['min_push_pair_rank'])
-        if has_high_pair:
+        if state.has_pair and state.pair_rank >= self.config['min_push_pair_rank']:
             return 'bet3'
         
         # Check for any other pair
-        has_any_pair, _ = HandAnalyzer.has_pair(ranks)
-        if has_any_pair:
+        if state.has_pair:
             return 'bet1'
         
         # Check point total
-        total_points = sum(card_points(card, self.config) for card in hand)
-        if total_points >= self.config['step2_bet_threshold']:
+        if state.points(self.config) >= self.config['step2_bet_threshold']:
             return 'bet1'
         else:
             return 'fold'
@@ -94,31 +89,22 @@ class PointStrategy(BaseStrategy):
         Returns:
             str: 'fold', 'bet1', or 'bet3' based on the hand.
         """
-        ranks = [card % 13 for card in hand]
+        state = HandState.of(hand)
         
-        # Check for quads
-        has_quads, _ = HandAnalyzer.has_quads(ranks)
-        if has_quads:
-            return 'bet3'
-        
-        # Check for trips
-        has_trips, _ = HandAnalyzer.has_trips(ranks)
-        if has_trips:
+        # Check for quads or trips
+        if state.has_trips:
             return 'bet3'
         
         # Check for a pair of sixes or better
-        has_high_pair, _ = HandAnalyzer.has_pair(ranks, self.config['min_push_pair_rank'])
-        if has_high_pair:
+        if state.has_pair and state.pair_rank >= self.config['min_push_pair_rank']:
             return 'bet3'
         
         # Check for any other pair
-        has_any_pair, _ = HandAnalyzer.has_pair(ranks)
-        if has_any_pair:
+        if state.has_pair:
             return 'bet1'
         
         # Check point total
-        total_points = sum(card_points(card, self.config) for card in hand)
-        if total_points >= self.config['step3_bet_threshold']:
+        if state.points(self.config) >= self.config['step3_bet_threshold']:
             return 'bet1'
         else:
             return 'fold'
@@ -0,0 +1,46 @@
+"""
+Table Strategy for Mississippi Stud betting decisions.
+"""
+
+from .base_strategy import BaseStrategy
+from config import DEFAULT_BET
+from utils.exact_ev import BET_SIZES
+
+
+class TableStrategy(BaseStrategy):
+    """
+    Plays another strategy's precomputed decisions from a DecisionTable
+    (see utils.shared_tables), so worker processes need neither the original
+    strategy's state nor its warm-up. It tracks the amount wagered on the
+    current hand, which is part of the table key.
+    """
+
+    def __init__(self, decision_table, config=None):
+        """
+        Initialize the Table Strategy.
+        Args:
+            decision_table (DecisionTable): The recorded decisions to play.
+            config (dict): Optional configuration dictionary.
+        """
+        super().__init__(config)
+        self.decision_table = decision_table
+        self.committed = DEFAULT_BET
+
+    def _decide(self, hand):
+        action = self.decision_table.decide(hand, self.committed)
+        if action != 'fold':
+            self.committed += BET_SIZES[action]
+        return action
+
+    def eval_step_1(self, hand):
+        """Table lookup for step 1; starts a new hand."""
+        self.committed = DEFAULT_BET
+        return self._decide(hand)
+
+    def eval_step_2(self, hand):
+        """Table lookup for step 2."""
+        return self._decide(hand)
+
+    def eval_step_3(self, hand):
+        """Table lookup for step 3."""
+        return self._decide(hand)
@@ -0,0 +1,168 @@
+"""
+Stratified Mississippi Stud simulation over the 169 canonical starting hands.
+
+Each canonical 2-card start (pair, suited or offsuit ranks) is a stratum weighted
+by its exact probability. Strata the strategy folds at step 1 are worth exactly
+-DEFAULT_BET and are never sampled; the hand budget goes to the remaining strata
+by Neyman allocation, using the per-stratum variance observed so far.
+A stratum whose sampled payouts are all equal has a sample variance of zero, so
+each stratum's variance is floored at the pooled variance divided by its hand
+count; otherwise it would get no further hands and understate the error.
+"""
+
+import math
+import random
+from itertools import combinations
+
+from deuces import Card
+from config import DEFAULT_BET, STRATIFIED_CONFIG
+from mississippi_stud_sim import get_strategy, simulate_hand
+from utils.cards import card_rank, card_suit, full_deck
+
+
+def starting_hand_label(hand):
+    """
+    Canonical label of a 2-card start, e.g. 'AA', 'AKs' or 'T9o'.
+    Args:
+        hand (list): Two deuces cards.
+    Returns:
+        str: The starting-hand label.
+    """
+    high, low = sorted(hand, key=card_rank, reverse=True)
+    label = Card.STR_RANKS[card_rank(high)] + Card.STR_RANKS[card_rank(low)]
+    if card_rank(high) == card_rank(low):
+        return label
+    return label + ('s' if card_suit(high) == card_suit(low) else 'o')
+
+
+def starting_hand_strata():
+    """
+    Group all 1326 two-card starts into the 169 canonical starting hands.
+    Returns:
+        dict: Mapping of starting-hand label to its list of 2-card combos.
+    """
+    strata = {}
+    for hand in combinations(full_deck(), 2):
+        strata.setdefault(starting_hand_label(hand), []).append(list(hand))
+    return strata
+
+
+def _neyman_allocation(budget, strata_stats):
+    """
+    Split a hand budget across strata proportionally to weight * standard deviation.
+    Args:
+        budget (int): Hands to allocate.
+        strata_stats (dict): Per-stratum stats with 'weight', 'hands', 'sum' and 'sum_sq'.
+    Returns:
+        dict: Mapping of stratum label to its number of extra hands.
+    """
+    pooled = _pooled_variance(strata_stats)
+    scores = {label: stats['weight'] * math.sqrt(_variance(stats, pooled))
+              for label, stats in strata_stats.items()}
+    if sum(scores.values()) == 0:
+        scores = {label: stats['weight'] for label, stats in strata_stats.items()}
+    total = sum(scores.values())
+    shares = {label: budget * score / total for label, score in scores.items()}
+    allocation = {label: int(share) for label, share in shares.items()}
+    # Hand out the rounding remainder to the largest fractional shares
+    leftover = budget - sum(allocation.values())
+    for label in sorted(shares, key=lambda l: shares[l] - allocation[l], reverse=True)[:leftover]:
+        allocation[label] += 1
+    return allocation
+
+
+def _variance(stats, pooled=0.0):
+    """
+    Sample variance of a stratum's payouts, floored at pooled / hands.
+    Args:
+        stats (dict): The stratum's 'hands', 'sum' and 'sum_sq'.
+        pooled (float): Pooled variance of all sampled strata.
+    """
+    n = stats['hands']
+    if n < 2:
+        return pooled
+    return max(max(stats['sum_sq'] - stats['sum'] ** 2 / n, 0.0) / (n - 1), pooled / n)
+
+
+def _pooled_variance(strata_stats):
+    """Sample variance of every payout sampled so far, across strata."""
+    return _variance({key: sum(stats[key] for stats in strata_stats.values())
+                      for key in ('hands', 'sum', 'sum_sq')})
+
+
+def _sample(stats, combos, strategy, hands):
+    for _ in range(hands):
+        payout, _ = simulate_hand(strategy=strategy, start_cards=random.choice(combos))
+        stats['hands'] += 1
+        stats['sum'] += payout
+        stats['sum_sq'] += payout * payout
+
+
+def simulate_stratified(number_of_hands, strategy_name='point', show_chart=True, verbose=True):
+    """
+    Estimate a strategy's EV per hand with stratified sampling over starting hands.
+    Args:
+        number_of_hands (int): Number of hands to simulate across non-folding strata.
+        strategy_name (str): Name of the strategy to use.
+        show_chart (bool): If True, print the per-start EV chart.
+        verbose (bool): If False, print nothing.
+    Returns:
+        dict: 'ev' and 'std_error' of the EV per hand, 'hands' simulated, and
+            'strata' mapping each starting-hand label to its 'weight', 'hands',
+            'ev', 'std_error' and whether it 'folds'.
+    """
+    strategy = get_strategy(strategy_name)
+    strata = starting_hand_strata()
+    total_combos = sum(len(combos) for combos in strata.values())
+
+    results = {}
+    sampled = {}
+    for label, combos in strata.items():
+        weight = len(combos) / total_combos
+        if all(strategy.eval_step_1(list(hand)) == 'fold' for hand in combos):
+            results[label] = {'weight': weight, 'hands': 0, 'ev': -DEFAULT_BET, 'std_error': 0.0, 'folds': True}
+        else:
+            sampled[label] = {'weight': weight, 'hands': 0, 'sum': 0.0, 'sum_sq': 0.0}
+
+    if sampled:
+        pilot = min(STRATIFIED_CONFIG['pilot_hands'], number_of_hands // len(sampled))
+        if pilot < 2:
+            raise ValueError(f"Need at least {2 * len(sampled)} hands to sample {len(sampled)} non-folding strata")
+        for label, stats in sampled.items():
+            _sample(stats, strata[label], strategy, pilot)
+        remaining = number_of_hands - pilot * len(sampled)
+        rounds = STRATIFIED_CONFIG['allocation_rounds']
+        for round_index in range(rounds):
+            budget = remaining // (rounds - round_index)
+            for label, hands in _neyman_allocation(budget, sampled).items():
+                _sample(sampled[label], strata[label], strategy, hands)
+            remaining -= budget
+
+    pooled = _pooled_variance(sampled) if sampled else 0.0
+    for label, stats in sampled.items():
+        n = stats['hands']
+        results[label] = {
+            'weight': stats['weight'],
+            'hands': n,
+            'ev': stats['sum'] / n,
+            'std_error': math.sqrt(_variance(stats, pooled) / n),
+            'folds': False,
+        }
+
+    ev = sum(r['weight'] * r['ev'] for r in results.values())
+    std_error = math.sqrt(sum((r['weight'] * r['std_error']) ** 2 for r in results.values()))
+    hands = sum(r['hands'] for r in results.values())
+
+    if verbose:
+        print(f"Stratified simulation of {hands} hands ({len(sampled)} of {len(results)} starting hands sampled).")
+        print(f"EV per hand: {ev:.5f} +/- {std_error:.5f}")
+    if verbose and show_chart:
+        print("Starting-hand EV chart:")
+        for label, r in sorted(results.items(), key=lambda item: -item[1]['ev']):
+            detail = "folds" if r['folds'] else f"+/- {r['std_error']:.4f} ({r['hands']} hands)"
+            print(f"  {label:>3}: {r['ev']:8.4f} {detail}")
+    return {'ev': ev, 'std_error': std_error, 'hands': hands, 'strata': results}
+
+
+if __name__ == "__main__":
+    simulate_stratified(20000, strategy_name='point')
@@ -9,21 +9,24 @@ import os
 # Add the current directory to the path to import the module
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-# Import the main module
-import mississippi_stud_sim as sim_module
+# Results are archived, so rerunning the comparison does not re-simulate
+from distributed_sim import print_results
+from results_archive import ResultsArchive
 
 if __name__ == "__main__":
     print("Testing different strategies with 100 hands each:")
     print("=" * 60)
+    archive = ResultsArchive()
     
     print("\nPoint Strategy (default):")
-    sim_module.simulate(100, show_each_hand=False, strategy_name='point')
+    print_results(archive.simulate(100, strategy_name='point', unit_hands=100))
     
     print("\nConservative Strategy:")
-    sim_module.simulate(100, show_each_hand=False, strategy_name='conservative')
+    print_results(archive.simulate(100, strategy_name='conservative', unit_hands=100))
     
     print("\nOptimal Strategy:")
-    sim_module.simulate(100, show_each_hand=False, strategy_name='optimal')
+    print_results(archive.simulate(100, strategy_name='optimal', unit_hands=100))
     
+    archive.close()
     print("\n" + "=" * 60)
     print("All strategies comparison complete!")
@@ -4,5 +4,7 @@ Contains helper classes and functions for hand analysis.
 """
 
 from .hand_analyzer import HandAnalyzer
+from .cards import card_rank, card_suit
+from .hand_state import HandState
 
-__all__ = ['HandAnalyzer']
+__all__ = ['HandAnalyzer', 'HandState', 'card_rank', 'card_suit']
@@ -0,0 +1,65 @@
+"""
+Card decoding helpers for Mississippi Stud simulation.
+
+deuces represents a card as a bit-packed integer (see ``deuces.Card``), so the
+rank and suit cannot be recovered with ``card % 13`` / ``card // 13``. All code
+that needs a card's rank or suit should go through these helpers.
+"""
+
+from deuces import Card, Deck
+
+# Suit indices used throughout the simulator: 0=spades, 1=hearts, 2=diamonds, 3=clubs
+SUIT_CHARS = 'shdc'
+_SUIT_INT_TO_INDEX = {1: 0, 2: 1, 4: 2, 8: 3}
+
+
+def card_rank(card):
+    """
+    Returns the rank of a card.
+    Args:
+        card (int): The integer-encoded card from deuces.
+    Returns:
+        int: The rank (0=2, 1=3, ..., 8=10, 9=J, 10=Q, 11=K, 12=A).
+    """
+    return (card >> 8) & 0xF
+
+
+def card_suit(card):
+    """
+    Returns the suit index of a card.
+    Args:
+        card (int): The integer-encoded card from deuces.
+    Returns:
+        int: The suit index (0=spades, 1=hearts, 2=diamonds, 3=clubs).
+    """
+    return _SUIT_INT_TO_INDEX[(card >> 12) & 0xF]
+
+
+def make_card(rank, suit):
+    """
+    Builds a deuces card from a rank and suit index.
+    Args:
+        rank (int): The rank (0=2, ..., 12=A).
+        suit (int): The suit index (0=spades, 1=hearts, 2=diamonds, 3=clubs).
+    Returns:
+        int: The integer-encoded card.
+    """
+    return Card.new(Card.STR_RANKS[rank] + SUIT_CHARS[suit])
+
+
+def parse_cards(text):
+    """
+    Parses a whitespace-separated list of card strings such as ``"As Kd 7h"``.
+    Args:
+        text (str): The card strings.
+    Returns:
+        list: The integer-encoded cards.
+    """
+    return [Card.new(token) for token in text.split()]
+
+
+def full_deck():
+    """
+    Returns a new list holding the 52 deuces cards in a fixed order.
+    """
+    return Deck.GetFullDeck()
@@ -0,0 +1,57 @@
+"""
+Helpers for walking a strategy through every deal over suit-isomorphic states.
+Strategies are called on representative hands of canonical states, so they must
+depend only on the cards up to a relabelling of suits.
+"""
+
+from utils.cards import make_card
+from utils.exact_ev import EMPTY_STATE, deal_one, state_cards
+
+_representative_cache = {}
+
+
+def representative_hand(key):
+    """
+    Deuces cards of a canonical state's representative hand.
+    Args:
+        key (StateKey): The canonical state.
+    Returns:
+        list: The representative hand (shared; do not modify).
+    """
+    hand = _representative_cache.get(key)
+    if hand is None:
+        known, _ = state_cards(key)
+        hand = _representative_cache[key] = [make_card(rank, suit) for rank, suit in known]
+    return hand
+
+
+def replay_decisions(strategy, hands):
+    """
+    Replay a strategy's steps on successive hands, stopping at a fold.
+    Replaying from step 1 lets strategies that track the current hand work.
+    Args:
+        strategy: A strategy instance.
+        hands (list): The 2-, 3- and 4-card hands, in order.
+    Returns:
+        list: The actions taken.
+    """
+    steps = (strategy.eval_step_1, strategy.eval_step_2, strategy.eval_step_3)
+    actions = []
+    for step, hand in zip(steps, hands):
+        actions.append(step(list(hand)))
+        if actions[-1] == 'fold':
+            break
+    return actions
+
+
+def two_card_states():
+    """
+    Canonical 2-card states with the number of ordered deals leading to each.
+    Returns:
+        dict: Mapping of canonical state to its weight; the weights sum to 52 * 51.
+    """
+    states = {}
+    for key1, count1 in deal_one(EMPTY_STATE):
+        for key2, count2 in deal_one(key1):
+            states[key2] = states.get(key2, 0) + count1 * count2
+    return states
@@ -0,0 +1,206 @@
+"""
+Exact expected values for Mississippi Stud decisions.
+
+Values are computed by enumerating the remaining deck under optimal play and
+memoized on canonical, suit-isomorphic states: two partial hands that differ
+only by a relabelling of suits share one cache entry.
+"""
+
+from typing import Dict, Iterable, List, Tuple
+
+from config import DEFAULT_BET
+from utils.cards import card_rank, card_suit
+from utils.lru_cache import LRUCache
+from utils.payouts import OUTCOME_PAYOUTS, classify_hand
+
+# Amount added to the wager by each betting action
+BET_SIZES = {'bet1': 1, 'bet3': 3}
+ACTIONS = ('fold', 'bet1', 'bet3')
+
+# A canonical state: per suit, the sorted ranks held by the player and the
+# sorted ranks known to be out of the deck, with the suit groups sorted.
+StateKey = Tuple[Tuple[Tuple[int, ...], Tuple[int, ...]], ...]
+
+# The state before any card is dealt
+EMPTY_STATE: StateKey = (((), ()),) * 4
+
+
+def canonical_state(hand: Iterable[int], dead_cards: Iterable[int] = ()) -> StateKey:
+    """
+    Build the suit-isomorphic canonical key of a partial hand.
+    Args:
+        hand (Iterable[int]): The player's deuces cards.
+        dead_cards (Iterable[int]): Cards known to be out of the deck.
+    Returns:
+        StateKey: The canonical state key.
+    """
+    return _canonical([(card_rank(c), card_suit(c)) for c in hand],
+                      [(card_rank(c), card_suit(c)) for c in dead_cards])
+
+
+def _canonical(known, dead) -> StateKey:
+    groups = [([], []) for _ in range(4)]
+    for rank, suit in known:
+        groups[suit][0].append(rank)
+    for rank, suit in dead:
+        groups[suit][1].append(rank)
+    return tuple(sorted(((tuple(sorted(k)), tuple(sorted(d))) for k, d in groups), reverse=True))
+
+
+def state_cards(key: StateKey):
+    """
+    Representative cards of a canonical state.
+    Args:
+        key (StateKey): The canonical state.
+    Returns:
+        tuple: (known, dead) lists of (rank, suit) pairs, suits numbered by group.
+    """
+    known, dead = [], []
+    for suit, (known_ranks, dead_ranks) in enumerate(key):
+        known.extend((rank, suit) for rank in known_ranks)
+        dead.extend((rank, suit) for rank in dead_ranks)
+    return known, dead
+
+
+def deal_one(key: StateKey) -> List[Tuple[StateKey, int]]:
+    """
+    Canonical states reachable by dealing the player one more card.
+    Args:
+        key (StateKey): The canonical state.
+    Returns:
+        List[Tuple[StateKey, int]]: Each child state with the number of cards leading to it.
+    """
+    known, dead = state_cards(key)
+    counts: Dict[StateKey, int] = {}
+    for card in remaining_cards(known, dead):
+        child = _canonical(known + [card], dead)
+        counts[child] = counts.get(child, 0) + 1
+    return list(counts.items())
+
+
+def state_size(key: StateKey) -> int:
+    """Number of player cards in a canonical state."""
+    return sum(len(known) for known, _ in key)
+
+
+class ExactEVCalculator:
+    """
+    Computes exact expected values of fold, bet1 and bet3 for partial hands.
+    EVs are net results in the same units as simulate_hand(): the ante is
+    DEFAULT_BET and each bet adds 1 or 3 to the wager.
+    """
+
+    def __init__(self, cache_size=None):
+        """
+        Initialize the calculator with empty caches.
+        Args:
+            cache_size (int): Maximum entries per state cache, or None for unbounded caches.
+                States with dead cards are numerous, so long-running services should bound them.
+        """
+        self._children_cache = LRUCache(cache_size)
+        self._showdown_cache = LRUCache(cache_size)
+        self._value_cache = LRUCache(cache_size)
+        self._action_cache = LRUCache(cache_size)
+        self._payout_cache: Dict[Tuple[Tuple[int, ...], bool], int] = {}
+
+    def action_evs(self, hand: List[int], committed: int = DEFAULT_BET,
+                   dead_cards: Iterable[int] = ()) -> Dict[str, float]:
+        """
+        Exact EV of each action for a 2-, 3- or 4-card hand, assuming optimal play afterwards.
+        Args:
+            hand (List[int]): The player's deuces cards.
+            committed (int): Total amount already wagered (ante plus earlier bets).
+            dead_cards (Iterable[int]): Cards known to be out of the deck.
+        Returns:
+            Dict[str, float]: Mapping of 'fold', 'bet1' and 'bet3' to their EV.
+        """
+        if not 2 <= len(hand) <= 4:
+            raise ValueError(f"Expected a 2, 3 or 4 card hand, got {len(hand)} cards")
+        dead_cards = list(dead_cards)
+        if 52 - len(hand) - len(dead_cards) < 5 - len(hand):
+            raise ValueError("Too few cards left in the deck to finish the hand")
+        return dict(self.state_action_evs(canonical_state(hand, dead_cards), committed))
+
+    def best_action(self, hand: List[int], committed: int = DEFAULT_BET,
+                    dead_cards: Iterable[int] = ()) -> str:
+        """
+        The EV-maximizing action for a partial hand.
+        Returns:
+            str: 'fold', 'bet1' or 'bet3'.
+        """
+        evs = self.action_evs(hand, committed, dead_cards)
+        return max(ACTIONS, key=evs.__getitem__)
+
+    def state_action_evs(self, key: StateKey, committed: int) -> Dict[str, float]:
+        """
+        Exact EV of each action for a canonical state.
+        Results are cached per (state, committed), so a repeated situation is one lookup.
+        Args:
+            key (StateKey): The canonical state from canonical_state().
+            committed (int): Total amount already wagered.
+        Returns:
+            Dict[str, float]: Mapping of 'fold', 'bet1' and 'bet3' to their EV. The dict
+                is the cached one and must not be modified.
+        """
+        cache_key = (key, committed)
+        evs = self._action_cache.get(cache_key)
+        if evs is None:
+            evs = self._compute_action_evs(key, committed)
+            self._action_cache[cache_key] = evs
+        return evs
+
+    def _compute_action_evs(self, key: StateKey, committed: int) -> Dict[str, float]:
+        evs = {'fold': -committed}
+        if state_size(key) == 4:
+            mean_payout = self._showdown_mean(key)
+            for action, size in BET_SIZES.items():
+                evs[action] = mean_payout * (committed + size)
+            return evs
+        children = self._children(key)
+        total = sum(count for _, count in children)
+        for action, size in BET_SIZES.items():
+            evs[action] = sum(count * self._value(child, committed + size)
+                              for child, count in children) / total
+        return evs
+
+    def _value(self, key: StateKey, committed: int) -> float:
+        cache_key = (key, committed)
+        value = self._value_cache.get(cache_key)
+        if value is None:
+            value = max(self.state_action_evs(key, committed).values())
+            self._value_cache[cache_key] = value
+        return value
+
+    def _children(self, key: StateKey) -> List[Tuple[StateKey, int]]:
+        """Canonical states reachable by dealing one more card, with multiplicities."""
+        children = self._children_cache.get(key)
+        if children is None:
+            children = deal_one(key)
+            self._children_cache[key] = children
+        return children
+
+    def _showdown_mean(self, key: StateKey) -> float:
+        """Mean net payout multiplier of a 4-card state over every possible fifth card."""
+        mean = self._showdown_cache.get(key)
+        if mean is None:
+            known, dead = state_cards(key)
+            remaining = remaining_cards(known, dead)
+            mean = sum(self._payout(known + [card]) for card in remaining) / len(remaining)
+            self._showdown_cache[key] = mean
+        return mean
+
+    def _payout(self, cards) -> int:
+        ranks = tuple(sorted(rank for rank, _ in cards))
+        is_flush = len({suit for _, suit in cards}) == 1
+        payout = self._payout_cache.get((ranks, is_flush))
+        if payout is None:
+            suits = [0] * 5 if is_flush else [0, 1, 2, 3, 3]
+            payout = OUTCOME_PAYOUTS[classify_hand(list(ranks), suits)]
+            self._payout_cache[(ranks, is_flush)] = payout
+        return payout
+
+
+def remaining_cards(known, dead):
+    """The (rank, suit) pairs not held by the player and not dead."""
+    taken = set(known) | set(dead)
+    return [(rank, suit) for suit in range(4) for rank in range(13) if (rank, suit) not in taken]
@@ -5,6 +5,8 @@ Hand analysis utilities for Mississippi Stud strategies.
 from collections import Counter
 from typing import List, Tuple, Optional, Dict
 
+from .cards import card_rank
+
 
 class HandAnalyzer:
     """
@@ -27,6 +29,7 @@ class HandAnalyzer:
     def has_pair(ranks: List[int], min_rank: Optional[int] = None) -> Tuple[bool, Optional[int]]:
         """
         Check if the hand has a pair, optionally of minimum rank.
+        With two pairs, the higher pair is reported regardless of card order.
         Args:
             ranks (List[int]): List of card ranks.
             min_rank (Optional[int]): Minimum rank for the pair. If None, any pair counts.
@@ -34,7 +37,7 @@ class HandAnalyzer:
             Tuple[bool, Optional[int]]: (has_pair, pair_rank). pair_rank is None if no pair found.
         """
         rank_counts = HandAnalyzer.get_rank_counts(ranks)
-        for rank, count in rank_counts.items():
+        for rank, count in sorted(rank_counts.items(), reverse=True):
             if count >= 2 and (min_rank is None or rank >= min_rank):
                 return True, rank
         return False, None
@@ -103,7 +106,7 @@ class HandAnalyzer:
         Returns:
             bool: True if straight draw exists, False otherwise.
         """
-        ranks = [card % 13 for card in cards]
+        ranks = [card_rank(card) for card in cards]
         return HandAnalyzer._has_straight_draw_from_ranks(ranks, 3)
     
     @staticmethod
@@ -156,7 +159,7 @@ class HandAnalyzer:
         Returns:
             Optional[int]: The rank of the pair, or None if no pair found.
         """
-        ranks = [card % 13 for card in cards]
+        ranks = [card_rank(card) for card in cards]
         _, pair_rank = HandAnalyzer.has_pair(ranks)
         return pair_rank
     
@@ -169,7 +172,7 @@ class HandAnalyzer:
         Returns:
             Optional[int]: The rank of the trips, or None if no trips found.
         """
-        ranks = [card % 13 for card in cards]
+        ranks = [card_rank(card) for card in cards]
         _, trips_rank = HandAnalyzer.has_trips(ranks)
         return trips_rank
     
@@ -182,6 +185,6 @@ class HandAnalyzer:
         Returns:
             Optional[int]: The rank of the quads, or None if no quads found.
         """
-        ranks = [card % 13 for card in cards]
+        ranks = [card_rank(card) for card in cards]
         _, quads_rank = HandAnalyzer.has_quads(ranks)
         return quads_rank
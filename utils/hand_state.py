@@ -0,0 +1,224 @@
+"""
+Incrementally maintained state of a Mississippi Stud hand.
+
+HandState is a list of deuces cards that also keeps rank counts, suit counts,
+point-class counts and pair/trips/draw summaries up to date as each card is
+appended, so strategies and payout resolution read them in O(1) instead of
+re-analyzing the cards at every step. The counts are kept in a few integers
+(rank bit masks and packed 4-bit counters), so dealing a card allocates nothing.
+"""
+
+from typing import Iterable, List, Optional
+
+from config import STRATEGY_CONFIG
+from utils.cards import card_rank, card_suit, full_deck
+
+# 13-bit rank masks of the ten straights, A-2-3-4-5 first
+STRAIGHT_MASKS = [0b1000000001111] + [0b11111 << low for low in range(9)]
+_STRAIGHTS = frozenset(STRAIGHT_MASKS)
+
+# Packed suit counters of a 5-card flush, one 4-bit counter per suit
+_FLUSHES = frozenset(5 << 4 * suit for suit in range(4))
+
+
+def _point_class(rank: int) -> int:
+    """0 for low cards (2-5), 1 for push cards (6-10), 2 for high cards (J-A)."""
+    if rank >= 9:
+        return 2
+    return 1 if rank >= 4 else 0
+
+
+# Per-card (rank bit, suit counter increment, point-class counter increment),
+# so dealing a card is one lookup
+_CARD_INFO = {card: (1 << card_rank(card), 1 << 4 * card_suit(card), 1 << 4 * _point_class(card_rank(card)))
+              for card in full_deck()}
+
+
+class HandState(list):
+    """
+    A player's hand that updates its summary statistics as cards are dealt.
+    It is a list of cards, so strategies written against plain card lists keep
+    working; HandState.of() gives strategies the state of any hand they are passed.
+    Cards can only be added (append, extend or +=); list methods that would
+    replace or remove cards raise TypeError, since the summaries cannot follow them.
+    """
+
+    # singles, pairs, trips and quads are bit masks of the ranks held exactly
+    # once, twice, three and four times; suits and classes pack a 4-bit count
+    # per suit and per point class
+    __slots__ = ('singles', 'pairs', 'trips', 'quads', 'suits', 'classes')
+
+    def __init__(self, cards: Iterable[int] = ()):
+        """
+        Args:
+            cards (Iterable[int]): Deuces cards already dealt.
+        """
+        self.singles = self.pairs = self.trips = self.quads = self.suits = self.classes = 0
+        for card in cards:
+            self.append(card)
+
+    @classmethod
+    def of(cls, hand: List[int]) -> 'HandState':
+        """
+        The HandState of a hand, building one if a plain list is passed.
+        Args:
+            hand (List[int]): A HandState or a list of deuces cards.
+        Returns:
+            HandState: The hand's state.
+        """
+        return hand if isinstance(hand, cls) else cls(hand)
+
+    def append(self, card: int) -> None:
+        """Deal one more card into the hand, updating the summaries."""
+        list.append(self, card)
+        bit, suit, point_class = _CARD_INFO[card]
+        if self.singles & bit:
+            self.singles ^= bit
+            self.pairs |= bit
+        elif self.pairs & bit:
+            self.pairs ^= bit
+            self.trips |= bit
+        elif self.trips & bit:
+            self.trips ^= bit
+            self.quads |= bit
+        else:
+            self.singles |= bit
+        self.suits += suit
+        self.classes += point_class
+
+    def extend(self, cards: Iterable[int]) -> None:
+        for card in cards:
+            self.append(card)
+
+    def __iadd__(self, cards: Iterable[int]) -> 'HandState':
+        self.extend(cards)
+        return self
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("HandState cards can only be added with append, extend or +=")
+
+    __setitem__ = __delitem__ = __imul__ = insert = pop = remove = clear = _read_only
+
+    def __reduce__(self):
+        # Rebuild from the cards, so pickle and copy restore the summaries too
+        return type(self), (list(self),)
+
+    @property
+    def rank_mask(self) -> int:
+        """Bit mask of the ranks held."""
+        return self.singles | self.pairs | self.trips | self.quads
+
+    def rank_count(self, rank: int) -> int:
+        """Number of cards of a rank held."""
+        bit = 1 << rank
+        if self.singles & bit:
+            return 1
+        if self.pairs & bit:
+            return 2
+        if self.trips & bit:
+            return 3
+        return 4 if self.quads & bit else 0
+
+    def suit_count(self, suit: int) -> int:
+        """Number of cards of a suit index (see utils.cards.card_suit) held."""
+        return self.suits >> 4 * suit & 0xF
+
+    @property
+    def max_suit_count(self) -> int:
+        """Number of cards in the longest suit."""
+        suits = self.suits
+        return max(suits & 0xF, suits >> 4 & 0xF, suits >> 8 & 0xF, suits >> 12)
+
+    @property
+    def high_cards(self) -> int:
+        """Number of cards ranked Jack or higher."""
+        return self.classes >> 8
+
+    @property
+    def pair_rank(self) -> Optional[int]:
+        """Highest rank held at least twice, or None."""
+        mask = self.pairs | self.trips | self.quads
+        return mask.bit_length() - 1 if mask else None
+
+    @property
+    def trips_rank(self) -> Optional[int]:
+        """Highest rank held at least three times, or None."""
+        mask = self.trips | self.quads
+        return mask.bit_length() - 1 if mask else None
+
+    @property
+    def quads_rank(self) -> Optional[int]:
+        """Rank held four times, or None."""
+        return self.quads.bit_length() - 1 if self.quads else None
+
+    @property
+    def has_pair(self) -> bool:
+        return (self.pairs | self.trips | self.quads) != 0
+
+    @property
+    def has_trips(self) -> bool:
+        return (self.trips | self.quads) != 0
+
+    @property
+    def has_quads(self) -> bool:
+        return self.quads != 0
+
+    def flush_draw(self, min_suited: int = 3) -> bool:
+        """Whether at least min_suited cards share a suit."""
+        return self.max_suit_count >= min_suited
+
+    def straight_draw(self, min_ranks: int = 3) -> bool:
+        """Whether at least min_ranks distinct ranks fit inside one straight."""
+        mask = self.rank_mask
+        return any((mask & straight).bit_count() >= min_ranks for straight in STRAIGHT_MASKS)
+
+    def points(self, config: Optional[dict] = None) -> int:
+        """
+        Point total of the hand under the strategy card_points values.
+        Args:
+            config (Optional[dict]): Strategy configuration holding card_points.
+        Returns:
+            int: The point total.
+        """
+        card_points = (config or STRATEGY_CONFIG)['card_points']
+        classes = self.classes
+        return ((classes & 0xF) * card_points['low_cards'] + (classes >> 4 & 0xF) * card_points['push_cards']
+                + (classes >> 8) * card_points['high_cards'])
+
+    def outcome(self, config: Optional[dict] = None) -> str:
+        """
+        Outcome category of a finished 5-card hand, matching classify_hand().
+        Args:
+            config (Optional[dict]): Strategy configuration holding the pair thresholds.
+        Returns:
+            str: One of HAND_OUTCOMES.
+        """
+        if len(self) != 5:
+            raise ValueError(f"Expected a 5 card hand, got {len(self)} cards")
+        config = config or STRATEGY_CONFIG
+        is_flush = self.suits in _FLUSHES
+        # Only five distinct ranks leave all bits in singles
+        is_straight = self.singles in _STRAIGHTS
+        if is_straight and is_flush:
+            return 'royal_flush' if self.singles == STRAIGHT_MASKS[-1] else 'straight_flush'
+        if self.quads:
+            return 'four_of_a_kind'
+        if self.trips and self.pairs:
+            return 'full_house'
+        if is_flush:
+            return 'flush'
+        if is_straight:
+            return 'straight'
+        if self.trips:
+            return 'three_of_a_kind'
+        pairs = self.pairs
+        if pairs & (pairs - 1):
+            return 'two_pair'
+        if pairs:
+            pair_rank = pairs.bit_length() - 1
+            if pair_rank >= config['min_high_pair_rank']:
+                return 'pair_jacks_or_better'
+            if pair_rank >= config['min_push_pair_rank']:
+                return 'pair_6_to_10'
+            return 'loss'
+        return 'high_card'
@@ -0,0 +1,54 @@
+"""
+Bounded least-recently-used cache used to memoize exact EV computations.
+"""
+
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    A dict-like cache that evicts the least recently used entry once it holds maxsize entries.
+    With maxsize None it never evicts.
+    """
+
+    def __init__(self, maxsize=None):
+        """
+        Initialize the cache.
+        Args:
+            maxsize (int): Maximum number of entries, or None for an unbounded cache.
+        """
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        """Return the cached value for key, marking it as recently used."""
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self.hits += 1
+        if self.maxsize is not None:
+            self._data.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self._data[key] = value
+        if self.maxsize is not None:
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def clear(self):
+        """Remove every entry and reset the hit/miss statistics."""
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
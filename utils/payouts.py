@@ -0,0 +1,84 @@
+"""
+Payout resolution for Mississippi Stud hands.
+Maps a finished 5-card hand to its outcome category and net payout multiplier.
+"""
+
+from collections import Counter
+from typing import Dict, List, Optional
+
+from config import PAYOUT_TABLE, ROYAL_FLUSH_PAYOUT, STRATEGY_CONFIG
+
+# Net result per unit wagered for each outcome: paying hands win their
+# PAYOUT_TABLE multiple, pairs of 6-10 push, everything else loses the wager.
+OUTCOME_PAYOUTS: Dict[str, int] = {
+    'royal_flush': ROYAL_FLUSH_PAYOUT,
+    'straight_flush': PAYOUT_TABLE[1],
+    'four_of_a_kind': PAYOUT_TABLE[2],
+    'full_house': PAYOUT_TABLE[3],
+    'flush': PAYOUT_TABLE[4],
+    'straight': PAYOUT_TABLE[5],
+    'three_of_a_kind': PAYOUT_TABLE[6],
+    'two_pair': PAYOUT_TABLE[7],
+    'pair_jacks_or_better': PAYOUT_TABLE[8],
+    'pair_6_to_10': 0,
+    'high_card': -1,
+    'loss': -1,
+}
+
+# hand_result strings simulate_hand() reports for each showdown outcome
+OUTCOME_DESCRIPTIONS: Dict[str, str] = {
+    'royal_flush': 'Straight Flush',
+    'straight_flush': 'Straight Flush',
+    'four_of_a_kind': 'Four of a Kind',
+    'full_house': 'Full House',
+    'flush': 'Flush',
+    'straight': 'Straight',
+    'three_of_a_kind': 'Three of a Kind',
+    'two_pair': 'Two Pair',
+    'pair_jacks_or_better': 'Pair Jacks or Better',
+    'pair_6_to_10': 'Pair 6 to 10',
+    'high_card': 'loss (high card)',
+    'loss': 'loss (pair 2-5)',
+}
+
+
+def classify_hand(ranks: List[int], suits: List[int], config: Optional[dict] = None) -> str:
+    """
+    Classify a finished 5-card hand into one of the HAND_OUTCOMES categories.
+    Pairs below the push-pair rank are reported as 'loss', matching simulate_hand().
+    Args:
+        ranks (List[int]): The five card ranks (0=2, ..., 12=A).
+        suits (List[int]): The five card suits.
+        config (Optional[dict]): Strategy configuration holding the pair thresholds.
+    Returns:
+        str: The outcome category.
+    """
+    config = config or STRATEGY_CONFIG
+    counts = Counter(ranks)
+    shape = sorted(counts.values(), reverse=True)
+    is_flush = len(set(suits)) == 1
+    unique = sorted(counts)
+    is_straight = len(unique) == 5 and (unique[4] - unique[0] == 4 or unique == [0, 1, 2, 3, 12])
+
+    if is_straight and is_flush:
+        return 'royal_flush' if unique[0] == 8 else 'straight_flush'
+    if shape[0] == 4:
+        return 'four_of_a_kind'
+    if shape[:2] == [3, 2]:
+        return 'full_house'
+    if is_flush:
+        return 'flush'
+    if is_straight:
+        return 'straight'
+    if shape[0] == 3:
+        return 'three_of_a_kind'
+    if shape[:2] == [2, 2]:
+        return 'two_pair'
+    if shape[0] == 2:
+        pair_rank = next(rank for rank, count in counts.items() if count == 2)
+        if pair_rank >= config['min_high_pair_rank']:
+            return 'pair_jacks_or_better'
+        if pair_rank >= config['min_push_pair_rank']:
+            return 'pair_6_to_10'
+        return 'loss'
+    return 'high_card'
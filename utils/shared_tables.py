@@ -0,0 +1,226 @@
+"""
+Precomputed lookup tables shared between worker processes.
+
+SharedTables packs a 5-card outcome table and per-strategy decision tables into
+one multiprocessing.shared_memory block. The parent process builds it once and
+workers attach to it by name and read it in place, so per-worker memory and
+start-up time stay flat as workers are added.
+"""
+
+import bisect
+from itertools import combinations_with_replacement
+from multiprocessing import shared_memory
+
+from config import DEFAULT_BET, HAND_OUTCOMES
+from utils.cards import card_rank, card_suit
+from utils.enumeration import replay_decisions, representative_hand, two_card_states
+from utils.exact_ev import ACTIONS, BET_SIZES, deal_one
+from utils.payouts import classify_hand
+
+# The outcome table holds one byte (an index into HAND_OUTCOMES) per sorted
+# 5-rank combination in base 13, for non-flush and flush hands.
+OUTCOME_TABLE_SIZE = 13 ** 5 * 2
+
+
+def outcome_index(ranks, is_flush):
+    """
+    Position of a 5-card hand in the outcome table.
+    Args:
+        ranks (list): The five card ranks.
+        is_flush (bool): Whether all five cards share a suit.
+    Returns:
+        int: The table index.
+    """
+    index = 0
+    for rank in sorted(ranks):
+        index = index * 13 + rank
+    return index * 2 + is_flush
+
+
+def hand_code(hand, committed):
+    """
+    Suit-isomorphic integer code of a partial hand and the amount wagered so far.
+    The per-suit rank masks are sorted, so hands that differ only by a relabelling
+    of suits share a code.
+    Args:
+        hand (list): The player's deuces cards.
+        committed (int): Total amount already wagered (at most 15).
+    Returns:
+        int: The 56-bit code.
+    """
+    masks = [0, 0, 0, 0]
+    for card in hand:
+        masks[card_suit(card)] |= 1 << card_rank(card)
+    masks.sort(reverse=True)
+    return (((masks[0] << 39) | (masks[1] << 26) | (masks[2] << 13) | masks[3]) << 4) | committed
+
+
+def build_outcome_table():
+    """
+    Build the 5-card outcome table.
+    Returns:
+        bytearray: OUTCOME_TABLE_SIZE outcome indices.
+    """
+    table = bytearray(OUTCOME_TABLE_SIZE)
+    for ranks in combinations_with_replacement(range(13), 5):
+        if any(ranks.count(rank) > 4 for rank in ranks):
+            continue
+        table[outcome_index(ranks, False)] = HAND_OUTCOMES.index(classify_hand(list(ranks), [0, 1, 2, 3, 0]))
+        if len(set(ranks)) == 5:
+            table[outcome_index(ranks, True)] = HAND_OUTCOMES.index(classify_hand(list(ranks), [0] * 5))
+    return table
+
+
+def build_decision_table(strategy):
+    """
+    Record a strategy's decision at every state it can reach.
+    A decision is assumed to depend only on the hand (up to suits) and the amount
+    wagered so far, which is what the table is keyed on; each such state is
+    expanded once.
+    Args:
+        strategy: A suit-symmetric strategy instance.
+    Returns:
+        list: Sorted (hand_code, action index) pairs.
+    """
+    decisions = {}
+
+    def walk(key, path, committed):
+        hands = path + [representative_hand(key)]
+        code = hand_code(hands[-1], committed)
+        if code in decisions:
+            return
+        action = replay_decisions(strategy, hands)[-1]
+        decisions[code] = ACTIONS.index(action)
+        if action != 'fold' and len(hands) < 3:
+            for child, _ in deal_one(key):
+                walk(child, hands, committed + BET_SIZES[action])
+
+    for key in two_card_states():
+        walk(key, [], DEFAULT_BET)
+    return sorted(decisions.items())
+
+
+class DecisionTable:
+    """
+    Read-only view of one strategy's decisions inside a shared block.
+    """
+
+    def __init__(self, codes, actions):
+        """
+        Args:
+            codes (memoryview): Sorted hand codes, as unsigned 64-bit integers.
+            actions (memoryview): Action index for each code.
+        """
+        self.codes = codes
+        self.actions = actions
+
+    def decide(self, hand, committed):
+        """
+        Look up the recorded action for a hand.
+        Returns:
+            str: 'fold', 'bet1' or 'bet3'.
+        """
+        code = hand_code(hand, committed)
+        i = bisect.bisect_left(self.codes, code)
+        if i == len(self.codes) or self.codes[i] != code:
+            raise KeyError(f"No recorded decision for a {len(hand)}-card hand with {committed} wagered")
+        return ACTIONS[self.actions[i]]
+
+
+class SharedTables:
+    """
+    Outcome and strategy-decision tables in one shared memory block.
+    Create them once with SharedTables.create() and pass .spec to workers,
+    which call SharedTables.attach(spec). The creator must close() the tables
+    (or use them as a context manager) to free the block.
+    """
+
+    def __init__(self, shm, layout, owner):
+        self._shm = shm
+        self.layout = layout
+        self._owner = owner
+        buffer = shm.buf
+        self._outcomes = buffer[:OUTCOME_TABLE_SIZE]
+        self._decisions = {}
+        for name, (offset, count) in layout.items():
+            codes = buffer[offset:offset + 8 * count].cast('Q')
+            actions = buffer[offset + 8 * count:offset + 9 * count]
+            self._decisions[name] = DecisionTable(codes, actions)
+
+    @classmethod
+    def create(cls, strategies):
+        """
+        Build the tables into a new shared memory block.
+        Args:
+            strategies (dict): Mapping of strategy name to strategy instance.
+        Returns:
+            SharedTables: The owning handle.
+        """
+        outcome_table = build_outcome_table()
+        tables = {name: build_decision_table(strategy) for name, strategy in strategies.items()}
+        layout = {}
+        size = OUTCOME_TABLE_SIZE
+        for name, entries in tables.items():
+            size += -size % 8  # keep the 64-bit codes aligned
+            layout[name] = (size, len(entries))
+            size += 9 * len(entries)
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        shm.buf[:OUTCOME_TABLE_SIZE] = outcome_table
+        for name, entries in tables.items():
+            offset, count = layout[name]
+            codes = shm.buf[offset:offset + 8 * count].cast('Q')
+            for i, (code, action) in enumerate(entries):
+                codes[i] = code
+                shm.buf[offset + 8 * count + i] = action
+            codes.release()
+        return cls(shm, layout, owner=True)
+
+    @classmethod
+    def attach(cls, spec):
+        """
+        Attach to tables created in another process.
+        Args:
+            spec (tuple): The creator's .spec.
+        Returns:
+            SharedTables: A read-only handle.
+        """
+        name, layout = spec
+        return cls(shared_memory.SharedMemory(name=name), layout, owner=False)
+
+    @property
+    def spec(self):
+        """Picklable (block name, layout) pair that workers attach with."""
+        return self._shm.name, self.layout
+
+    def __contains__(self, strategy_name):
+        return strategy_name in self._decisions
+
+    def outcome(self, hand):
+        """
+        Outcome category of a finished 5-card hand.
+        Returns:
+            str: One of HAND_OUTCOMES.
+        """
+        is_flush = len({card_suit(card) for card in hand}) == 1
+        return HAND_OUTCOMES[self._outcomes[outcome_index([card_rank(card) for card in hand], is_flush)]]
+
+    def decision_table(self, strategy_name):
+        """The DecisionTable of a strategy included at creation."""
+        return self._decisions[strategy_name]
+
+    def close(self):
+        """Release this handle, freeing the block if it is the creator's."""
+        for table in self._decisions.values():
+            table.codes.release()
+            table.actions.release()
+        self._decisions = {}
+        self._outcomes.release()
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()